@@ -1,9 +1,4 @@
-import pygame
 from pygame.sprite import Sprite
-from pathlib import Path
-
-current_dir = Path(__file__).resolve().parent
-alien_path = f"{current_dir}/images/alien.bmp"
 
 
 class Alien(Sprite):
@@ -12,11 +7,11 @@ class Alien(Sprite):
     def __init__(self, ai_game):
         super().__init__()
         self.screen = ai_game.screen
+        self.screen_rect = ai_game.screen_rect
         self.settings = ai_game.settings
 
-        # Load the alien image and set its rect attribute
-        self.image = pygame.image.load(
-            alien_path)
+        # Use the shared alien image and set its rect attribute
+        self.image = ai_game.assets.image("alien.bmp")
         self.rect = self.image.get_rect()
 
         # start each new alien near the top left of the screen
@@ -26,12 +21,19 @@ class Alien(Sprite):
         # store the alien's exact horizontal position
         self.x = float(self.rect.x)
 
+    def reset(self, x, y):
+        """Place a pooled alien at a new grid position."""
+        self.x = float(x)
+        self.rect.x = x
+        self.rect.y = y
+
     def check_edges(self):
         """Return true if alien is at the edge of screen."""
-        screen_rect = self.screen.get_rect()
-        return (self.rect.right >= screen_rect.right) or (self.rect.left <= 0)
+        return (self.rect.right >= self.screen_rect.right) or \
+            (self.rect.left <= 0)
 
     def update(self):
         """Move alien to the right."""
-        self.x += self.settings.alien_speed * self.settings.fleet_direction
+        self.x += (self.settings.alien_speed * self.settings.fleet_direction
+                   * self.settings.step_scale)
         self.rect.x = self.x
@@ -1,84 +1,174 @@
-# import sys
-from pathlib import Path
-from time import sleep
+import sys
+import argparse
+import os
+import random
 import pygame  # type: ignore
-# from check_sensors import get_cpu_temp
 from settings import Settings
 from ship import Ship
-from bullet import Bullet
+from bullet import BulletPool
 from alien import Alien
-from star import Star
+from starfield import Starfield
 from game_stats import GameStats
 from button import Button
 from scoreboard import ScoreBoard
-# import psutil
-# import platform
-# import subprocess
-
-current_dir = Path(__file__).resolve().parent
-laser_path = f"{current_dir}/sounds/laser.wav"
-explosion_path = f"{current_dir}/sounds/explosion.wav"
+from assets import AssetCache
+from audio import AudioManager, configure_mixer
+from display import Display
+from renderer import DirtyRenderer
+from render_pipeline import DrawList, RenderPipeline
+from game_loop import FixedStepLoop
+from array_fleet import ArrayFleet
+from spatial_hash import SpatialHash
+from fleet_bounds import FleetBounds
+from fleet_layout import fleet_template
+from scheduler import Scheduler
+from startup import StartupTimer
+from score_store import ScoreStore, settings_snapshot
+from input_handler import DEFAULT_BINDINGS, InputHandler
+from profiler import FrameProfiler
+from profiles import ProfileWatcher, load_settings
+from replay import (ACTION_FIRE, ACTION_LEFT, ACTION_RIGHT, Recorder,
+                    Recording, replay)
 
 
 class AlienInvasion:
     """Overall class to manage game assets and behavior"""
 
-    def __init__(self):
-        pygame.init()
-
-        # initialize mixer for sound
-        pygame.mixer.init()
-        self.laser_sound = pygame.mixer.Sound(laser_path)
-        self.explosion_sound = pygame.mixer.Sound(explosion_path)
+    def __init__(self, headless=False, seed=None, settings=None):
+        # headless runs use SDL's dummy drivers: no window and no sound
+        # device, so the game logic can be stepped in CI or faster than
+        # real time
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+        # time each stage so slow starts show up
+        self.startup = StartupTimer()
+
+        # initialize settings from settings.py, unless given prepared ones
+        self.settings = settings if settings is not None else Settings()
+
+        if headless:
+            self.settings.respawn_pause = 0
+
+        # every random choice derives from this seed so a recorded game
+        # can be replayed exactly
+        self.seed = seed if seed is not None else random.randrange(2 ** 31)
+        if self.settings.star_seed is None:
+            self.settings.star_seed = self.seed
+
+        # open the window first, initialising only the modules we use;
+        # the mixer is started by the audio manager
+        with self.startup.stage("display"):
+            pygame.display.init()
+            # the game plays on a fixed logical screen; the display scales
+            # it to the window or to fullscreen
+            self.display = Display(self.settings)
+            self.screen = self.display.canvas
+            pygame.display.set_caption("Alien Invasion")
+            self.screen.fill(self.settings.bg_color)
+            self.display.present()
+            # layout and collisions use logical coordinates, even when the
+            # canvas is drawn at a lower resolution
+            self.screen_rect = pygame.Rect((0, 0), self.display.logical_size)
 
         # initialize clock method for refresh rate
         self.clock = pygame.time.Clock()
 
-        # # for performance monitoring
-        # self.cpu_usage_history = []
-        # self.cpu_update_interval = 30
-        # self.frame_count = 0
+        # timed game states run on simulation time, not wall time
+        self.scheduler = Scheduler()
+        self.respawning = False
+
+        # input recording and playback
+        self.recorder = None
+        self.replayer = None
+        self._fire_requested = False
+        self.loop = FixedStepLoop(self.settings)
+
+        with self.startup.stage("input"):
+            # keyboard and mouse input, filtered to the events the game uses
+            self.input = InputHandler(self.settings.key_bindings)
+            self.input.install()
+
+        with self.startup.stage("images"):
+            # load images once; sprites share these references
+            self.assets = AssetCache()
+            self.assets.preload()
+
+        with self.startup.stage("audio"):
+            # the mixer and sounds load on a background thread; sounds play
+            # on reserved channels, at most once per frame each
+            configure_mixer(self.settings)
+            self.audio = AudioManager(self)
+
+        with self.startup.stage("sprites"):
+            self.ship = Ship(self)
+
+            # initialize bullets from a preallocated pool
+            self.bullets = BulletPool(self)
+
+            # initialize aliens, as NumPy columns if asked for and available
+            self.array_fleet = (self.settings.array_fleet
+                                and ArrayFleet.available)
+            if self.array_fleet:
+                self.aliens = ArrayFleet(self)
+            else:
+                self.aliens = pygame.sprite.Group()
+            # grid of the sprite fleet for bullet collision queries
+            self.alien_index = SpatialHash(
+                max(self.assets.image("alien.bmp").get_size()))
+            # the sprite fleet's extent, for edge and bottom checks
+            self.fleet_bounds = FleetBounds()
+            # aliens kept across fleets so a new fleet is only a reset;
+            # the first fleet is built when a game starts
+            self._alien_pool = []
+
+        # initialize the renderer; its stars are drawn before the first
+        # frame, so headless games never render them
+        self.renderer = DirtyRenderer(self)
+        self.starfield = None
+        # composes frames on a worker thread when threaded_render is set
+        self.pipeline = None
+        # reloads the settings profile when it is edited
+        self.profile_watcher = None
 
-        # initialize settings from settings.py
-        self.settings = Settings()
-        # self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        # self.settings.screen_width = self.screen.get_rect().width
-        # self.settings.screen_height = self.screen.get_rect().height
-        self.screen = pygame.display.set_mode(
-            (self.settings.screen_width, self.settings.screen_height))
-
-        pygame.display.set_caption("Alien Invasion")
-        self.ship = Ship(self)
+        # initialize game stats
+        self.stats = GameStats(self)
 
-        # initialize bullets
-        self.bullets = pygame.sprite.Group()
-        self.screen_rect = self.screen.get_rect()
+        with self.startup.stage("scores"):
+            # past results; headless runs don't touch the player's scores
+            self.scores = None
+            if self.settings.score_db_path and not headless:
+                self.scores = ScoreStore(self.settings.score_db_path)
+                self.stats.high_score = self.scores.high_score()
+            self._game_started = 0.0
 
-        # initialize aliens
-        self.aliens = pygame.sprite.Group()
-        self._create_fleet()
+        with self.startup.stage("text"):
+            pygame.font.init()
+            self.sb = ScoreBoard(self)
 
-        # initialize stars
-        self.stars = pygame.sprite.Group()
-        self._create_star()
-
-        # initialize game stats
-        self.stats = GameStats(self)
-        self.sb = ScoreBoard(self)
+            # initialize the play button
+            self.play_button = Button(self, "Play")
 
         # start alien invasion in an inactive state
         self.game_active = False
 
-        # initialize the play button
-        self.play_button = Button(self, "Play")
+        # per-phase frame timing and its overlay
+        self.profiler = FrameProfiler(self)
+        self.startup.mark("ready")
 
     def _check_aliens_bottom(self):
         """Check if any aliens reached the bottom of the screen."""
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= self.settings.screen_height:
-                # Treat this the same as if the ship got hit.
+        if self.array_fleet:
+            if self.aliens.reached_bottom():
                 self._ship_hit()
-                break
+            return
+
+        if self.aliens and \
+                self.fleet_bounds.bottom >= self.screen_rect.bottom:
+            # Treat this the same as if the ship got hit.
+            self._ship_hit()
 
     def _ship_hit(self):
         """Respond to the ship being hit by an alien."""
@@ -94,75 +184,146 @@ class AlienInvasion:
             self._create_fleet()
             self.ship.center_ship()
 
-            # pause
-            sleep(0.5)
+            # pause play for a moment while the loop keeps running
+            if self.settings.respawn_pause:
+                self.respawning = True
+                self.scheduler.after(self.settings.respawn_pause,
+                                     self._end_respawn)
         else:
             self.game_active = False
             pygame.mouse.set_visible(True)
+            self._finish_recording()
+            self._save_result()
+
+    def _end_respawn(self):
+        """Resume play once the respawn pause is over."""
+        self.respawning = False
+
+    def _save_result(self):
+        """Queue the game that just ended to be stored, if keeping scores."""
+        # a replayed game was already stored when it was played
+        if self.scores is None or self.replayer is not None:
+            return
+        self.scores.add(self.stats.score, self.stats.level,
+                        self.scheduler.time - self._game_started, self.seed,
+                        settings_snapshot(self.settings))
+        # the writer stores it later; list it right away
+        self.sb.add_top_score(self.stats.score)
+
+    def _quit(self):
+        """Store the game in progress, then exit."""
+        if self.game_active:
+            self._save_result()
+        if self.scores is not None:
+            self.scores.close()
+        sys.exit()
+
+    def _settings_changed(self, names):
+        """Rebuild only what depends on settings that changed at runtime.
+
+        Returns the names of the caches that were rebuilt.
+        """
+        invalidated = []
+        if self.pipeline is not None:
+            # the worker may still be drawing with the caches
+            self.pipeline.wait()
+
+        if any(name.startswith("star_") for name in names) \
+                or "bg_color" in names:
+            if self.starfield is not None:
+                self._create_star()
+            invalidated.append("starfield")
+        if "bg_color" in names:
+            # glyphs are rendered on the background color
+            top_scores = self.sb.top_scores
+            self.sb = ScoreBoard(self)
+            self.sb.prep_top_scores(top_scores)
+            invalidated.append("text")
+        if names & {"bullet_width", "bullet_height", "bullet_color"}:
+            self.bullets.restyle()
+            invalidated.append("bullets")
+        if "key_bindings" in names:
+            # bindings dropped from the settings go back to the defaults
+            bindings = {**DEFAULT_BINDINGS, **self.settings.key_bindings}
+            for action, keys in bindings.items():
+                self.input.bind(action, *keys)
+            invalidated.append("key bindings")
+        if "profiler_enabled" in names:
+            self.profiler.enabled = self.settings.profiler_enabled
+        if "dirty_rendering" in names:
+            self.renderer.full_redraw = True
+        return invalidated
+
+    def _finish_recording(self):
+        """Save the input of the game that just ended, if recording."""
+        if self.recorder is None:
+            return
+        recording = self.recorder.finish(self.stats)
+        recording.save(self.settings.record_path)
+        self.recorder = None
 
     def _create_star(self):
-        """Create a background of stars."""
-        for _ in range(1000):
-            star = Star(self)
-            self.stars.add(star)
+        """Create a pre-rendered background of stars."""
+        self.starfield = Starfield(self)
+        self.renderer.set_background(self.starfield)
 
     def _create_fleet(self):
-        """Create a fleet of aliens."""
+        """Create a fleet of aliens from the cached grid layout."""
         self.aliens.empty()
-        # Create an alien and keep adding aliens until there's no room left
-        # Spacing between aliens is one alien width and one alien height
-        alien = Alien(self)
-
-        alien_width, alien_height = alien.rect.size
-        current_x, current_y = alien_width, alien_height
-
-        while current_y < (self.settings.screen_height - 3 * alien_height):
-            while current_x < (self.settings.screen_width - 2 * alien_width):
-                self._create_alien(current_x, current_y)
-                current_x += 2 * alien_width
-            # Finished a row; reset x value, and increment y value.
-            current_x = alien_width
-            current_y += 2 * alien_height
-
-        # add the alien to the sprite group
-        self.aliens.add(alien)
-
-    def _create_alien(self, x_position, y_position):
-        """Create an alien and place it in the row."""
-        new_alien = Alien(self)
-        new_alien.x = x_position
-        new_alien.rect.x = x_position
-        new_alien.rect.y = y_position
-        self.aliens.add(new_alien)
+        positions = fleet_template(
+            self.screen_rect.size, self.assets.image("alien.bmp").get_size())
+        if self.array_fleet:
+            self.aliens.build(positions)
+            return
+
+        # reuse the aliens of earlier fleets instead of constructing new ones
+        pool = self._alien_pool
+        while len(pool) < len(positions):
+            pool.append(Alien(self))
+        fleet = pool[:len(positions)]
+        for alien, (x, y) in zip(fleet, positions):
+            alien.reset(x, y)
+
+        self.aliens.add(fleet)
+        self.alien_index.rebuild(fleet)
+        self.fleet_bounds.rebuild(fleet)
 
     def _check_fleet_edges(self):
         """Respond correctly if any aliens have reached an edge"""
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
+        if self.array_fleet:
+            if self.aliens.check_edges():
                 self._change_fleet_direction()
-                break
+            return
+
+        bounds = self.fleet_bounds
+        if self.settings.fleet_bounds_check:
+            bounds.check(self.aliens)
+        if self.aliens and (bounds.right >= self.screen_rect.right
+                            or bounds.left <= 0):
+            self._change_fleet_direction()
 
     def _change_fleet_direction(self):
         """Drop the entire fleet and chagne the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
+        if self.array_fleet:
+            self.aliens.drop()
+        else:
+            for alien in self.aliens.sprites():
+                alien.rect.y += self.settings.fleet_drop_speed
+            self.alien_index.move(0, self.settings.fleet_drop_speed)
         self.settings.fleet_direction *= -1
 
     def _check_events(self):
         """Respond to keypress and mouse events efficiently."""
-        keys = pygame.key.get_pressed()
-        for event in pygame.event.get():
-
-            match event.type:
-                case pygame.QUIT:
-                    sys.exit()
-                case pygame.KEYDOWN:
-                    self._check_keydown_events(event, keys)
-                case pygame.KEYUP:
-                    self._check_keyup_events(event)
-                case pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-                    self._check_play_button(mouse_pos)
+        triggered = self.input.poll()
+        if self.input.quit:
+            self._quit()
+        for action in triggered:
+            self._check_action(action)
+        for mouse_pos in self.input.clicks:
+            self._check_play_button(self.display.to_logical(mouse_pos))
+        if self.input.exposed:
+            # the window was uncovered, so repaint all of it
+            self.renderer.full_redraw = True
 
     def _check_play_button(self, mouse_pos):
         """Start a new game when the player clicks Play."""
@@ -178,6 +339,13 @@ class AlienInvasion:
         # reset game stats
         self.stats.reset_stats()
         self.game_active = True
+        self.scheduler.clear()
+        self.respawning = False
+        self._game_started = self.scheduler.time
+
+        # record this game's input when a record path is set
+        if self.settings.record_path and self.replayer is None:
+            self.recorder = Recorder(self.seed, self.settings)
 
         self.settings.initialize_dynamic_settings()
 
@@ -197,14 +365,9 @@ class AlienInvasion:
 
     def _update_bullets(self):
         """Update the position of bullets and get rid of old bullets."""
-        # Update the bullet positions
+        # Update the bullet positions and recycle the ones that left
         self.bullets.update()
 
-        # get rid of the bullets that have disappeared
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
-
         self._check_bullet_alien_collisions()
 
     def _check_bullet_alien_collisions(self):
@@ -214,25 +377,44 @@ class AlienInvasion:
         if not self.aliens:  # Skip collision checks if no aliens exist
             return
 
-        # Get the lowest alien position to optimize bullet checks
-        min_alien_top = min(alien.rect.top for alien in self.aliens)
-
-        # Broad phase: Only check bullets that are near aliens
-        bullets_to_check = [
-            bullet for bullet in self.bullets
-            if bullet.rect.bottom > min_alien_top
-        ]
-
-        # Perform collision check only on nearby bullets
-        collisions = pygame.sprite.groupcollide(
-            pygame.sprite.Group(bullets_to_check), self.aliens, True, True)
+        if self.array_fleet:
+            # Broad phase: Only check bullets that are near aliens
+            min_alien_top = self.aliens.top()
+            bullets_to_check = [
+                bullet for bullet in self.bullets
+                if bullet.rect.bottom > min_alien_top
+            ]
+            collisions = self.aliens.collide_bullets(bullets_to_check)
+        elif self.settings.collision_grid:
+            collisions = self._collide_with_grid()
+        else:
+            # Get the lowest alien position to optimize bullet checks
+            min_alien_top = self.fleet_bounds.top
+
+            # Broad phase: Only check bullets that are near aliens
+            bullets_to_check = [
+                bullet for bullet in self.bullets
+                if bullet.rect.bottom > min_alien_top
+            ]
+
+            # Perform collision check only on nearby bullets; this is
+            # groupcollide with both kill flags, minus building a Group
+            collisions = {}
+            for bullet in bullets_to_check:
+                hit = pygame.sprite.spritecollide(bullet, self.aliens, True)
+                if hit:
+                    collisions[bullet] = hit
+                    bullet.kill()
+                    for alien in hit:
+                        self.alien_index.remove(alien)
+                        self.fleet_bounds.remove(alien)
 
         if collisions:
             for aliens in collisions.values():
                 self.stats.score += self.settings.alien_points * len(aliens)
             self.sb.prep_score()
             self.sb.check_high_score()
-            self.explosion_sound.play()
+            self.audio.play("explosion.wav")
 
         if not self.aliens:
             # Destroy bullets and create a new fleet
@@ -242,142 +424,268 @@ class AlienInvasion:
             self.stats.level += 1
             self.sb.prep_level()
 
-    def _update_screen(self):
-        """Update changed parts of the screen"""
-        changed_rects = []
-        self.screen.fill(self.settings.bg_color)
+    def _collide_with_grid(self):
+        """Kill bullets and aliens that overlap, using the fleet grid.
 
-        # update stars
-        for star in self.stars:
-            star.draw_star()
-            changed_rects.append(star.rect)
-
-        # update bullets
+        Bullets are resolved in group order, and each kills every alien it
+        overlaps, which is what groupcollide does with both kill flags set.
+        """
+        collisions = {}
+        index = self.alien_index
+        query = index.query
         for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
-            changed_rects.append(bullet.rect)
+            rect = bullet.rect
+            candidates = query(rect)
+            if not candidates:
+                continue
+            hit = [alien for alien in candidates
+                   if rect.colliderect(alien.rect)]
+            if hit:
+                collisions[bullet] = hit
+                bullet.kill()
+                for alien in hit:
+                    alien.kill()
+                    index.remove(alien)
+                    self.fleet_bounds.remove(alien)
+        return collisions
 
-        # update ship
-        self.ship.blitme()
-        changed_rects.append(self.ship.rect)
+    def _update_screen(self):
+        """Update changed parts of the screen"""
+        # the stars are only needed once something is drawn
+        if self.starfield is None:
+            with self.startup.stage("starfield"):
+                self._create_star()
 
-        # update aliens
-        self.aliens.draw(self.screen)
-        for alien in self.aliens:
-            changed_rects.append(alien.rect)
+        if self.pipeline is None:
+            self._draw_frame(self.renderer)
+            return
+
+        # present the frame the worker composed, then hand it the next one
+        self.pipeline.present()
+        self.pipeline.submit(self._draw_frame(DrawList()))
+
+    def _draw_frame(self, renderer):
+        """Draw the game with a renderer, or record it into a DrawList."""
+        # a scrolling starfield changes the whole background
+        if not self.starfield.static:
+            renderer.set_background(self.starfield)
+
+        # clear last frame's objects from the cached background
+        renderer.begin_frame()
+
+        # offsets that place moving objects between simulation steps
+        ship_rect = self.ship.rect
+        bullet_dy = alien_dx = 0
+        lag = 1 - self.loop.alpha
+        if self.game_active and not self.respawning and lag \
+                and self.settings.fixed_timestep and self.settings.interpolate:
+            step_scale = self.settings.step_scale
+            bullet_dy = round(lag * self.settings.bullet_speed * step_scale)
+            alien_dx = round(-lag * self.settings.alien_speed * step_scale
+                             * self.settings.fleet_direction)
+            ship_rect = ship_rect.move(
+                round(lag * (self.ship.prev_x - self.ship.x)), 0)
+
+        # update bullets, all blitting the pool's pre-rendered image
+        image = self.bullets.image
+        renderer.draw_batch("bullets", [
+            (bullet, image,
+             bullet.rect.move(0, bullet_dy) if bullet_dy else bullet.rect)
+            for bullet in self.bullets.sprites()])
+
+        # update ship, blinking it while it respawns
+        if not self.respawning or int(self.scheduler.time * 8) % 2:
+            renderer.draw_static("ship", self.ship.image, ship_rect)
+
+        # update aliens in one batch
+        if self.array_fleet:
+            image = self.aliens.image
+            size = image.get_size()
+            renderer.draw_batch("aliens", [
+                (index, image, pygame.Rect((x, y), size))
+                for index, x, y in self.aliens.blit_positions(alien_dx)])
+        else:
+            renderer.draw_batch("aliens", [
+                (alien, alien.image,
+                 alien.rect.move(alien_dx, 0) if alien_dx else alien.rect)
+                for alien in self.aliens.sprites()])
 
         # update score
-        self.sb.show_score()
-        changed_rects.append(self.sb.score_rect)
+        self.sb.draw(renderer)
 
         # update play button if game is inactive
         if not self.game_active:
-            self.play_button.draw_button()
-            changed_rects.append(self.play_button.rect)
-
-        # # get fps
-        # fps = self.clock.get_fps()
-
-        # # get cpu temp
-        # # cpu_temp = get_cpu_temp()
-
-        # # update cpu usage every X frames
-        # self.frame_count += 1
-        # if self.frame_count % self.cpu_update_interval == 0:
-        #     self.cpu_usage_history.append(psutil.cpu_percent(interval=0))
-        #     if len(self.cpu_usage_history) > 10:
-        #         self.cpu_usage_history.pop(0)
-
-        # # average cpu usage
-        # average_cpu_usage = sum(self.cpu_usage_history) / \
-        #     len(self.cpu_usage_history) if self.cpu_usage_history else 0
-
-        # # render fps and cpu usage text
-        # font = pygame.font.Font(None, 30)
-        # fps_text = font.render(
-        #     f"FPS: {fps:.2f}", True, (255, 255, 255))
-        # cpu_text = font.render(
-        #     f"CPU: {average_cpu_usage:.2f}%", True, (255, 255, 255))
-        # # temp_text = font.render(
-        # #     f"CPU Temp: {cpu_temp}", True, (255, 255, 255))
-        # self.screen.blit(fps_text, (10, 10))  # Display in top-left corner
-        # self.screen.blit(cpu_text, (10, 40))
-        # # self.screen.blit(temp_text, (10, 70))
-        # changed_rects.append(fps_text.get_rect(topleft=(10, 10)))
-        # changed_rects.append(cpu_text.get_rect(topleft=(10, 40)))
-        # # changed_rects.append(temp_text.get_rect(topleft=(10, 70)))
+            self.play_button.draw(renderer)
+            self.sb.draw_top_scores(renderer)
+
+        # frame statistics overlay
+        self.profiler.draw(renderer)
 
         # refresh only updated areas
-        pygame.display.update(changed_rects)
-
-    def _check_keydown_events(self, event, keys):
-        """Respond to keypress. (optimized)"""
-        # if keys[pygame.K_RIGHT]:
-        #     self.ship.moving_right = True
-        # if keys[pygame.K_LEFT]:
-        #     self.ship.moving_left = True
-        if event.key == pygame.K_p and not self.game_active:
-            self._start_game()
-        if event.key == pygame.K_SPACE:
-            self._fire_bullet()
-        if event.key == pygame.K_q:
-            sys.exit()
-
-    def _check_keyup_events(self, event):
-        """Respond to keyup events"""
-        match event.key:
-            case pygame.K_RIGHT:
-                self.ship.moving_right = False
-            case pygame.K_LEFT:
-                self.ship.moving_left = False
-            # case pygame.K_UP:
-            #     self.ship.moving_up = False
-            # case pygame.K_DOWN:
-            #     self.ship.moving_down = False
+        renderer.end_frame()
+        return renderer
+
+    def _check_action(self, action):
+        """Respond to an action triggered by a keypress."""
+        match action:
+            case "start":
+                if not self.game_active:
+                    self._start_game()
+            case "fire":
+                # fired on the next simulation step, so the shot is recorded
+                self._fire_requested = True
+            case "quit":
+                self._quit()
+            case "profiler":
+                self.profiler.toggle()
+            case "export_profile":
+                self.profiler.export_csv("frame_profile.csv")
+                self.profiler.export_json("frame_profile.json")
 
     def _fire_bullet(self):
-        """Create a new bullet and add it to the bullet group"""
-        if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
-            self.laser_sound.play()
+        """Take a bullet from the pool and launch it from the ship"""
+        if self.bullets.fire():
+            self.audio.play("laser.wav")
 
     def _update_aliens(self):
         """check if the fleet is at an edge, then update positions."""
         self._check_fleet_edges()
         self.aliens.update()
+        if not self.array_fleet:
+            self.alien_index.move(self.settings.alien_speed
+                                  * self.settings.fleet_direction
+                                  * self.settings.step_scale, 0)
 
         # look for alien-ship collisions
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
+        if self.array_fleet:
+            ship_hit = self.aliens.collide_rect(self.ship.rect)
+        else:
+            ship_hit = pygame.sprite.spritecollideany(self.ship, self.aliens)
+        if ship_hit:
             self._ship_hit()
 
         # look for aliens hitting the bottom of the screen
         self._check_aliens_bottom()
 
+    def _live_actions(self):
+        """Return the player's input for this step as an action byte."""
+        actions = 0
+        if self.input.held("left"):
+            actions |= ACTION_LEFT
+        if self.input.held("right"):
+            actions |= ACTION_RIGHT
+        if self._fire_requested:
+            actions |= ACTION_FIRE
+            self._fire_requested = False
+        return actions
+
+    def _apply_actions(self, actions):
+        """Steer and fire the ship from an action byte."""
+        self.ship.moving_left = bool(actions & ACTION_LEFT)
+        self.ship.moving_right = bool(actions & ACTION_RIGHT)
+        if actions & ACTION_FIRE:
+            self._fire_bullet()
+
+    def _step(self, actions=None):
+        """Advance the game simulation by one fixed step.
+
+        Input comes from a replay if one is playing, then from actions if
+        given, and otherwise from the keyboard.
+        """
+        # scroll the starfield when parallax is enabled
+        if self.starfield is not None:
+            self.starfield.update()
+        self.scheduler.advance(1 / self.settings.sim_hz)
+
+        if self.replayer is not None:
+            actions = self.replayer.next_actions()
+        elif actions is None:
+            actions = self._live_actions()
+
+        if self.game_active:
+            if self.recorder is not None:
+                self.recorder.record(actions)
+            # input and movement wait out the respawn pause
+            if self.respawning:
+                return
+            self._apply_actions(actions)
+
+            measure = self.profiler.measure
+
+            # update ships position
+            measure("ship", self.ship.update)
+
+            # update bullets
+            measure("bullets", self._update_bullets)
+
+            # update alien position
+            measure("aliens", self._update_aliens)
+
     def run_game(self):
         """Start main loop for game."""
+        if self.settings.threaded_render and self.pipeline is None:
+            self.pipeline = RenderPipeline(self.renderer)
+        if self.settings.profile_path and self.settings.watch_profile:
+            self.profile_watcher = ProfileWatcher(self)
         while True:
             # Watch for keyboard and mouse events
-            self._check_events()
+            self.profiler.measure("events", self._check_events)
 
-            if self.game_active:
-                # update ships position
-                self.ship.update()
+            # apply edits to the settings profile between frames
+            if self.profile_watcher is not None:
+                self.profile_watcher.check()
 
-                # update bullets
-                self._update_bullets()
+            if self.settings.fixed_timestep:
+                # run as many fixed steps as the elapsed time calls for
+                for _ in range(self.loop.advance()):
+                    self._step()
+                fps = self.settings.max_fps
+            else:
+                self._step()
+                fps = self.settings.sim_hz
 
-                # update alien position
-                self._update_aliens()
+            # start the sounds this frame's steps asked for
+            self.audio.flush()
 
             # redraw the screen during each pass through the loop
-            self._update_screen()
+            self.profiler.measure("render", self._update_screen)
+            self.profiler.end_frame()
+
+            if "first_frame" not in self.startup.stages:
+                self.startup.mark("first_frame")
+                if self.settings.startup_report:
+                    print(f"startup: {self.startup.format()}")
 
-            # update screen 60 times per second
-            self.clock.tick(60)
+            # cap the frame rate; a cap of 0 leaves the loop uncapped
+            self.clock.tick(fps)
 
 
 if __name__ == '__main__':
-    # make a game instance and run the game
-    ai = AlienInvasion()
-    ai.run_game()
+    parser = argparse.ArgumentParser(description="Play Alien Invasion.")
+    parser.add_argument("--record", metavar="PATH",
+                        help="save the input of the next game to PATH")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="play back a recorded game")
+    parser.add_argument("--headless", action="store_true",
+                        help="replay without a window and print the result")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print how long each startup stage took")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="load settings from a JSON or TOML profile "
+                             "and reload it when it changes")
+    parser.add_argument("--preset", help="start from a settings preset, "
+                                         "e.g. low-end or stress")
+    args = parser.parse_args()
+
+    if args.replay:
+        recording = Recording.load(args.replay)
+        score, level, ships_left = replay(recording, headless=args.headless)
+        print(f"score: {score}  level: {level}  ships left: {ships_left}")
+        if (score, level, ships_left) != recording.outcome:
+            print(f"replay diverged from recorded outcome {recording.outcome}")
+    else:
+        # make a game instance and run the game
+        ai = AlienInvasion(settings=load_settings(args.profile, args.preset))
+        ai.settings.record_path = args.record
+        ai.settings.startup_report = args.startup_report
+        ai.run_game()
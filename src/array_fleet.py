@@ -0,0 +1,166 @@
+import pygame  # type: ignore
+from pygame.sprite import Sprite
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the sprite fleet is used instead
+    np = None
+
+
+def to_pixels(values):
+    """Round positions half away from zero, the way pygame.Rect does."""
+    magnitude = np.abs(values)
+    whole = np.floor(magnitude)
+    # comparing the fraction avoids the rounding error of adding 0.5
+    return np.copysign(whole + (magnitude - whole >= 0.5),
+                       values).astype(int)
+
+
+class FleetAlien(Sprite):
+    """A thin sprite view of one alien stored in an ArrayFleet."""
+
+    def __init__(self, fleet, index):
+        super().__init__()
+        self.fleet = fleet
+        self.index = index
+        self.image = fleet.image
+
+    @property
+    def rect(self):
+        """Return the alien's rect, read from the fleet's columns."""
+        fleet = self.fleet
+        rect = pygame.Rect(0, 0, fleet.width, fleet.height)
+        # assigning rounds like Alien.rect does; the constructor truncates
+        rect.x = float(fleet.x[self.index])
+        rect.y = float(fleet.y[self.index])
+        return rect
+
+    def kill(self):
+        """Remove the alien from the fleet."""
+        self.fleet.kill(self.index)
+        super().kill()
+
+
+class ArrayFleet:
+    """A class to store the fleet as NumPy columns and move it in bulk."""
+
+    available = np is not None
+
+    def __init__(self, ai_game):
+        """Initialize an empty fleet using the shared alien image."""
+        self.settings = ai_game.settings
+        self.screen_rect = ai_game.screen_rect
+        self.image = ai_game.assets.image("alien.bmp")
+        self.width, self.height = self.image.get_size()
+
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.alive = np.zeros(0, dtype=bool)
+        self.count = 0
+        self._views = []
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def build(self, positions):
+        """Replace the fleet with live aliens at the given positions."""
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        self.x = positions[:, 0].copy()
+        self.y = positions[:, 1].copy()
+        self.alive = np.ones(len(positions), dtype=bool)
+        self.count = len(positions)
+        # views are kept between fleets and only added when it grows
+        while len(self._views) < self.count:
+            self._views.append(FleetAlien(self, len(self._views)))
+
+    def empty(self):
+        """Remove every alien."""
+        self.build([])
+
+    def sprites(self):
+        """Return sprite views of the live aliens."""
+        return [self._views[i] for i in np.flatnonzero(self.alive)]
+
+    def kill(self, indices):
+        """Mark one alien, or an array of aliens, as dead."""
+        self.alive[indices] = False
+        self.count = int(self.alive.sum())
+
+    def update(self):
+        """Move the whole fleet sideways in one operation."""
+        self.x += (self.settings.alien_speed * self.settings.fleet_direction
+                   * self.settings.step_scale)
+
+    def check_edges(self):
+        """Return True if any live alien is at the edge of the screen."""
+        if not self.count:
+            return False
+        x = to_pixels(self.x[self.alive])
+        # match the sprite path, which compares the rounded rect position
+        return (x.max() + self.width >= self.screen_rect.right
+                or x.min() <= 0)
+
+    def drop(self):
+        """Move the whole fleet down by the drop speed."""
+        self.y += self.settings.fleet_drop_speed
+
+    def reached_bottom(self):
+        """Return True if any live alien has reached the bottom."""
+        if not self.count:
+            return False
+        return self.y[self.alive].max() + self.height >= \
+            self.screen_rect.bottom
+
+    def top(self):
+        """Return the top edge of the highest live alien."""
+        return int(to_pixels(self.y[self.alive]).min())
+
+    def _overlaps(self, left, top, right, bottom):
+        """Return a mask of live aliens overlapping the given box(es)."""
+        x = to_pixels(self.x)
+        y = to_pixels(self.y)
+        return ((x < right) & (x + self.width > left)
+                & (y < bottom) & (y + self.height > top) & self.alive)
+
+    def collide_rect(self, rect):
+        """Return True if any live alien overlaps rect."""
+        return bool(self._overlaps(rect.left, rect.top, rect.right,
+                                   rect.bottom).any())
+
+    def collide_bullets(self, bullets):
+        """Kill bullets and aliens that overlap; return kills per bullet.
+
+        Bullets are resolved in order, so like groupcollide an alien only
+        counts for the first bullet that hits it.
+        """
+        if not self.count or not bullets:
+            return {}
+        bounds = np.array([(b.rect.left, b.rect.top, b.rect.right,
+                            b.rect.bottom) for b in bullets])
+        hits = self._overlaps(bounds[:, 0, None], bounds[:, 1, None],
+                              bounds[:, 2, None], bounds[:, 3, None])
+
+        collisions = {}
+        for row in np.flatnonzero(hits.any(axis=1)):
+            killed = hits[row] & self.alive
+            if killed.any():
+                bullet = bullets[row]
+                collisions[bullet] = [self._views[i]
+                                      for i in np.flatnonzero(killed)]
+                self.alive[killed] = False
+                bullet.kill()
+        self.count = int(self.alive.sum())
+        return collisions
+
+    def blit_positions(self, dx=0):
+        """Return (index, x, y) for every live alien, offset by dx."""
+        index = np.flatnonzero(self.alive)
+        x = to_pixels(self.x[index]) + dx
+        y = to_pixels(self.y[index])
+        return zip(index.tolist(), x.tolist(), y.tolist())
@@ -0,0 +1,75 @@
+import time
+from pathlib import Path
+import pygame  # type: ignore
+
+current_dir = Path(__file__).resolve().parent
+images_dir = current_dir / "images"
+sounds_dir = current_dir / "sounds"
+
+
+class AssetCache:
+    """A class to load images and sounds once and share them."""
+
+    def __init__(self):
+        """Initialize empty caches and the load counters."""
+        self._images = {}
+        self._sounds = {}
+
+        # cache statistics
+        self.hits = 0
+        self.misses = 0
+        self.load_time = 0.0
+
+    def image(self, name, alpha=False):
+        """Return the shared surface for an image in the images folder."""
+        key = (name, alpha)
+        surface = self._images.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        start = time.perf_counter()
+        surface = pygame.image.load(str(images_dir / name))
+        # convert to the display format so blits skip pixel conversion;
+        # this is only possible once a display mode has been set
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        self.load_time += time.perf_counter() - start
+
+        self._images[key] = surface
+        return surface
+
+    def sound(self, name):
+        """Return the shared Sound for a file in the sounds folder."""
+        sound = self._sounds.get(name)
+        if sound is not None:
+            self.hits += 1
+            return sound
+
+        self.misses += 1
+        start = time.perf_counter()
+        sound = pygame.mixer.Sound(str(sounds_dir / name))
+        self.load_time += time.perf_counter() - start
+
+        self._sounds[name] = sound
+        return sound
+
+    def preload(self):
+        """Load every image the game uses up front.
+
+        Sounds need the mixer, so the audio manager loads them once it has
+        opened it.
+        """
+        self.image("ship.bmp")
+        self.image("alien.bmp")
+
+    def report(self):
+        """Return the cache statistics as a dictionary."""
+        return {
+            "images": len(self._images),
+            "sounds": len(self._sounds),
+            "hits": self.hits,
+            "misses": self.misses,
+            "load_time_ms": self.load_time * 1000,
+        }
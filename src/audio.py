@@ -0,0 +1,110 @@
+import os
+import threading
+import pygame  # type: ignore
+
+
+def configure_mixer(settings):
+    """Set the mixer format; call before the mixer is initialised."""
+    pygame.mixer.pre_init(settings.audio_frequency, settings.audio_size,
+                          settings.audio_channels, settings.audio_buffer)
+
+
+class AudioManager:
+    """A class to play sounds on reserved channels with a voice cap.
+
+    Each sound gets its own group of channels, so rapid fire cannot steal
+    the channels explosions play on. Plays requested during a frame are
+    collected and each sound starts at most once per frame.
+
+    The mixer is opened and the sounds decoded on a background thread;
+    sounds asked for before that finishes are skipped.
+    """
+
+    def __init__(self, ai_game):
+        """Start loading the mixer and sounds in the background."""
+        self.settings = ai_game.settings
+        self.assets = ai_game.assets
+
+        # the dummy driver produces no sound, so don't mix any
+        self.enabled = (not ai_game.headless
+                        and os.environ.get("SDL_AUDIODRIVER") != "dummy")
+        self.ready = threading.Event()
+
+        self._sounds = {}
+        self._channels = {}
+        self._next = {}
+        self._pending = []
+
+        # audio statistics
+        self.requested = 0
+        self.played = 0
+        self.coalesced = 0
+        self.stolen = 0
+
+        if self.enabled:
+            self._loader = threading.Thread(target=self._load, daemon=True)
+            self._loader.start()
+
+    def _load(self):
+        """Open the mixer, then load the sounds and reserve channels."""
+        try:
+            if pygame.mixer.get_init() is None:
+                pygame.mixer.init()
+            self._reserve(self.settings.sound_voices)
+        except pygame.error:
+            self.enabled = False
+            return
+        self.ready.set()
+
+    def wait(self, timeout=None):
+        """Block until the sounds are loaded; return True if they are."""
+        return self.enabled and self.ready.wait(timeout)
+
+    def _reserve(self, voices):
+        """Load each sound and reserve its channels."""
+        total = sum(voices.values())
+        pygame.mixer.set_num_channels(total)
+        # reserved channels are never picked by Sound.play()
+        pygame.mixer.set_reserved(total)
+
+        first = 0
+        for name, count in voices.items():
+            self._sounds[name] = self.assets.sound(name)
+            self._channels[name] = [pygame.mixer.Channel(i)
+                                    for i in range(first, first + count)]
+            self._next[name] = 0
+            first += count
+
+    def play(self, name):
+        """Ask for a sound to start at the end of this frame."""
+        if not self.ready.is_set():
+            return
+        self.requested += 1
+        if name in self._pending:
+            self.coalesced += 1
+            return
+        self._pending.append(name)
+
+    def flush(self):
+        """Start the sounds requested since the last flush."""
+        for name in self._pending:
+            # voices are used in turn, so the next one is the oldest
+            index = self._next[name]
+            channels = self._channels[name]
+            channel = channels[index]
+            self._next[name] = (index + 1) % len(channels)
+            if channel.get_busy():
+                self.stolen += 1
+            channel.play(self._sounds[name])
+            self.played += 1
+        self._pending.clear()
+
+    def report(self):
+        """Return the audio statistics as a dictionary."""
+        return {
+            "enabled": self.enabled,
+            "requested": self.requested,
+            "played": self.played,
+            "coalesced": self.coalesced,
+            "stolen": self.stolen,
+        }
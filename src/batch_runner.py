@@ -0,0 +1,188 @@
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from headless import HeadlessGame, hunter_agent, idle_agent, random_agent
+
+# agents are looked up by name so jobs stay picklable
+AGENTS = {
+    "idle": lambda game, rng: idle_agent(game),
+    "random": random_agent,
+    "hunter": lambda game, rng: hunter_agent(game),
+}
+
+
+def parse_sweep(specs):
+    """Turn "name=v1,v2" strings into a list of parameter dictionaries."""
+    names, values = [], []
+    for spec in specs:
+        name, _, options = spec.partition("=")
+        names.append(name)
+        values.append([json.loads(option) for option in options.split(",")])
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def simulate(job):
+    """Play one headless game and return its result row."""
+    params, seed, agent_name, max_ticks = job
+    rng = random.Random(seed)
+    agent = AGENTS[agent_name]
+
+    headless = HeadlessGame(seed=seed)
+    headless.reset()
+    # applied after the reset, which restores the dynamic settings
+    settings = headless.game.settings
+    for name, value in params.items():
+        setattr(settings, name, value)
+
+    headless.run(max_ticks, lambda game: agent(game, rng))
+    stats = headless.game.stats
+    return {
+        **params,
+        "seed": seed,
+        "agent": agent_name,
+        "score": stats.score,
+        "level": stats.level,
+        "ticks": headless.ticks,
+        "game_over": not headless.game.game_active,
+    }
+
+
+def run_batch(jobs, workers):
+    """Run jobs on a pool of worker processes; return (rows, seconds)."""
+    start = time.perf_counter()
+    if workers == 1:
+        rows = [simulate(job) for job in jobs]
+    else:
+        # hand out several games at a time to keep the pool busy
+        chunksize = max(1, len(jobs) // (workers * 4))
+        # spawned workers start clean; a forked one inherits SDL's state
+        # from a parent that already ran games, which can deadlock
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=context) as pool:
+            rows = list(pool.map(simulate, jobs, chunksize=chunksize))
+    return rows, time.perf_counter() - start
+
+
+def summarize(rows, names):
+    """Aggregate result rows per parameter combination."""
+    groups = {}
+    for row in rows:
+        key = tuple(row[name] for name in names)
+        groups.setdefault(key, []).append(row)
+
+    table = []
+    for key, group in groups.items():
+        scores = [row["score"] for row in group]
+        table.append({
+            **dict(zip(names, key)),
+            "games": len(group),
+            "score_mean": statistics.fmean(scores),
+            "score_max": max(scores),
+            "level_mean": statistics.fmean(row["level"] for row in group),
+            "ticks_mean": statistics.fmean(row["ticks"] for row in group),
+        })
+    return table
+
+
+def print_table(table):
+    """Print the aggregated results as aligned columns."""
+    if not table:
+        return
+    columns = list(table[0])
+    cells = [[f"{row[column]:.1f}" if isinstance(row[column], float)
+              else str(row[column]) for column in columns] for row in table]
+    widths = [max(len(column), *(len(line[i]) for line in cells))
+              for i, column in enumerate(columns)]
+    print("  ".join(column.rjust(width)
+                    for column, width in zip(columns, widths)))
+    for line in cells:
+        print("  ".join(cell.rjust(width)
+                        for cell, width in zip(line, widths)))
+
+
+def measure_scaling(jobs, max_workers):
+    """Time the batch at doubling worker counts; return one row each."""
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+
+    results = []
+    for workers in counts:
+        _, seconds = run_batch(jobs, workers)
+        throughput = len(jobs) / seconds
+        base = results[0]["games_per_second"] if results else throughput
+        results.append({
+            "workers": workers,
+            "seconds": seconds,
+            "games_per_second": throughput,
+            # 1.0 means the speedup matched the number of workers
+            "efficiency": throughput / (base * workers),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run many headless games in parallel over settings.")
+    parser.add_argument("--sweep", action="append", default=[],
+                        metavar="NAME=V1,V2",
+                        help="settings values to try, e.g. speedup_scale="
+                             "1.05,1.1; repeat for a grid of several")
+    parser.add_argument("--games", type=int, default=20,
+                        help="games per parameter combination")
+    parser.add_argument("--agent", choices=sorted(AGENTS), default="random")
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--scaling", action="store_true",
+                        help="also time the batch at fewer workers")
+    parser.add_argument("--csv", metavar="PATH",
+                        help="write every game's result row to a CSV file")
+    parser.add_argument("--json", metavar="PATH",
+                        help="write the summary to a JSON file")
+    args = parser.parse_args()
+
+    combos = parse_sweep(args.sweep)
+    names = list(combos[0])
+    # every combination plays the same seeds so they are comparable
+    jobs = [(params, args.seed + number, args.agent, args.max_ticks)
+            for params in combos for number in range(args.games)]
+
+    rows, seconds = run_batch(jobs, args.workers)
+    table = summarize(rows, names)
+    print_table(table)
+    print(f"{len(jobs)} games in {seconds:.2f}s"
+          f"  {len(jobs) / seconds:.2f} games/s on {args.workers} workers")
+
+    scaling = []
+    if args.scaling:
+        scaling = measure_scaling(jobs, args.workers)
+        for result in scaling:
+            print(f"{result['workers']:>3} workers: "
+                  f"{result['games_per_second']:.2f} games/s"
+                  f"  efficiency {result['efficiency']:.0%}")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": table, "seconds": seconds,
+                       "workers": args.workers, "scaling": scaling},
+                      f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
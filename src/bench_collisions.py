@@ -0,0 +1,125 @@
+import argparse
+import random
+import time
+import pygame  # type: ignore
+from pygame.sprite import Sprite
+from spatial_hash import SpatialHash
+
+
+class Box(Sprite):
+    """A bare sprite with only a rect, standing in for bullets and aliens."""
+
+    def __init__(self, x, y, width, height):
+        super().__init__()
+        self.rect = pygame.Rect(x, y, width, height)
+
+
+def build_scene(alien_count, bullet_count, seed, size=(1200, 800)):
+    """Lay out a fleet grid and scatter bullets over the screen."""
+    rng = random.Random(seed)
+    width, height = size
+    alien_w, alien_h = 64, 64
+    aliens = []
+    # pack the fleet the way _create_fleet does, shrinking aliens if the
+    # requested count doesn't fit the screen
+    scale = 1.0
+    while True:
+        w, h = int(alien_w * scale), int(alien_h * scale)
+        positions = [(x, y)
+                     for y in range(h, height - 3 * h, 2 * h)
+                     for x in range(w, width - 2 * w, 2 * w)]
+        if len(positions) >= alien_count or w <= 4:
+            break
+        scale *= 0.8
+    for x, y in positions[:alien_count]:
+        aliens.append(Box(x, y, w, h))
+
+    bullets = [Box(rng.randrange(width), rng.randrange(height), 3, 15)
+               for _ in range(bullet_count)]
+    return aliens, bullets, w
+
+
+def collide_groupcollide(aliens, bullets):
+    """The original path: top-of-fleet filter, then groupcollide."""
+    alien_group = pygame.sprite.Group(aliens)
+    min_alien_top = min(alien.rect.top for alien in alien_group)
+    bullets_to_check = [bullet for bullet in bullets
+                        if bullet.rect.bottom > min_alien_top]
+    return pygame.sprite.groupcollide(
+        pygame.sprite.Group(bullets_to_check), alien_group, True, True)
+
+
+def build_grid(aliens, cell_size):
+    """Index the fleet, as AlienInvasion does once per new fleet."""
+    index = SpatialHash(cell_size)
+    index.rebuild(aliens)
+    return index
+
+
+def collide_grid(index, bullets):
+    """The grid path used by AlienInvasion._collide_with_grid."""
+    collisions = {}
+    for bullet in bullets:
+        rect = bullet.rect
+        candidates = index.query(rect)
+        if not candidates:
+            continue
+        hit = [alien for alien in candidates if rect.colliderect(alien.rect)]
+        if hit:
+            collisions[bullet] = hit
+            for alien in hit:
+                index.remove(alien)
+    return collisions
+
+
+def time_call(func, repeat, setup=lambda: None):
+    """Return the best time of repeat calls to func, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        func(state)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare groupcollide with the spatial grid.")
+    parser.add_argument("--aliens", type=int, nargs="+",
+                        default=[40, 400, 2000])
+    parser.add_argument("--bullets", type=int, nargs="+",
+                        default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'aliens':>7} {'bullets':>8} {'groupcollide ms':>16}"
+          f" {'grid ms':>9} {'speedup':>8} {'grid build ms':>13}")
+    for alien_count in args.aliens:
+        for bullet_count in args.bullets:
+            aliens, bullets, cell = build_scene(alien_count, bullet_count,
+                                                args.seed)
+            # both paths must kill exactly the same pairs
+            expected = {b.rect.topleft: sorted(a.rect.topleft for a in hit)
+                        for b, hit in collide_groupcollide(
+                            aliens, bullets).items()}
+            got = {b.rect.topleft: sorted(a.rect.topleft for a in hit)
+                   for b, hit in collide_grid(build_grid(aliens, cell),
+                                              bullets).items()}
+            assert expected == got, "grid and groupcollide disagree"
+
+            old = time_call(lambda _: collide_groupcollide(aliens, bullets),
+                            args.repeat)
+            # the game builds the grid once per fleet, so it is timed
+            # separately from the per-frame queries
+            new = time_call(lambda index: collide_grid(index, bullets),
+                            args.repeat, lambda: build_grid(aliens, cell))
+            build = time_call(lambda _: build_grid(aliens, cell),
+                              args.repeat)
+            print(f"{len(aliens):>7} {bullet_count:>8} {old:>16.3f}"
+                  f" {new:>9.3f} {old / new:>7.1f}x {build:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import statistics
+import time
+from settings import Settings
+
+
+def build_game(threaded, scale, seed):
+    """Create a game at a screen scale and start it."""
+    from alien_invasion import AlienInvasion
+    from render_pipeline import RenderPipeline
+
+    settings = Settings()
+    settings.screen_width = int(settings.screen_width * scale)
+    settings.screen_height = int(settings.screen_height * scale)
+    settings.score_db_path = None
+    settings.respawn_pause = 0
+    game = AlienInvasion(seed=seed, settings=settings)
+    game._start_game()
+    if threaded:
+        game.pipeline = RenderPipeline(game.renderer)
+    return game
+
+
+def run(threaded, frames, scale, seed):
+    """Play frames uncapped with a scripted agent and time them."""
+    from headless import hunter_agent
+    from replay import encode_actions
+
+    game = build_game(threaded, scale, seed)
+    # steps per frame at the capped frame rate; uncapped (0) renders after
+    # every step
+    max_fps = game.settings.max_fps
+    steps = max(1, game.settings.sim_hz // max_fps) if max_fps else 1
+    latencies = []
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        game._check_events()
+        for _ in range(steps):
+            game._step(encode_actions(*hunter_agent(game)))
+        game.audio.flush()
+        render_start = time.perf_counter()
+        game._update_screen()
+        if not threaded:
+            # the serial loop presents the frame it has just drawn
+            latencies.append(time.perf_counter() - render_start)
+    elapsed = time.perf_counter() - start
+
+    if threaded:
+        game.pipeline.stop()
+        latencies = list(game.pipeline.latencies)
+    return {
+        "mode": "threaded" if threaded else "serial",
+        "frames": frames,
+        "seconds": elapsed,
+        "frames_per_second": frames / elapsed,
+        "latency_mean_ms": statistics.fmean(latencies) * 1000,
+        "latency_p95_ms": sorted(latencies)[int(len(latencies) * 0.95)]
+        * 1000,
+        "score": game.stats.score,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the serial render loop with the threaded "
+                    "pipeline.")
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="screen size relative to the default")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dummy", action="store_true",
+                        help="use SDL's dummy video driver (no window)")
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write the results to a JSON file")
+    args = parser.parse_args()
+
+    if args.dummy:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    results = [run(threaded, args.frames, args.scale, args.seed)
+               for threaded in (False, True)]
+    for result in results:
+        print(f"{result['mode']:>8}: {result['frames_per_second']:,.0f} "
+              f"frames/s  latency mean {result['latency_mean_ms']:.2f}ms"
+              f"  p95 {result['latency_p95_ms']:.2f}ms"
+              f"  score {result['score']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from alien_invasion import AlienInvasion
+from headless import HeadlessGame, random_agent
+from replay import Recording, replay
+from settings import Settings
+
+
+def make_corpus(directory, games, max_ticks, seed):
+    """Record games played by seeded random agents into a directory."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for number in range(games):
+        rng = random.Random(seed + number)
+        path = directory / f"random_{seed + number}.airp"
+        headless = HeadlessGame(seed=seed + number)
+        headless.game.settings.record_path = str(path)
+        headless.reset()
+        headless.run(max_ticks, lambda game: random_agent(game, rng))
+        # stop recording games that hit max_ticks before game over
+        headless.game._finish_recording()
+        print(f"recorded {path} ({headless.ticks} ticks)")
+
+
+def bench_recording(path, headless=True):
+    """Replay one recording under the profiler and return its results."""
+    recording = Recording.load(path)
+    # build the game from the recorded settings, as replay() does
+    settings = Settings()
+    recording.apply(settings)
+    settings.profiler_enabled = True
+    settings.profiler_history = max(len(recording), 1)
+    game = AlienInvasion(headless=headless, seed=recording.seed,
+                         settings=settings)
+
+    start = time.perf_counter()
+    outcome = replay(recording, headless=headless, game=game,
+                     on_step=lambda game: game.profiler.end_frame())
+    elapsed = time.perf_counter() - start
+
+    summary = game.profiler.summary()
+    return {
+        "recording": str(path),
+        "ticks": len(recording),
+        "seconds": elapsed,
+        "ticks_per_second": len(recording) / elapsed if elapsed else 0.0,
+        "outcome": list(outcome),
+        "deterministic": outcome == recording.outcome,
+        "step_p50_ms": summary["frame_p50_ms"],
+        "step_p95_ms": summary["frame_p95_ms"],
+        "step_p99_ms": summary["frame_p99_ms"],
+        "phase_avg_ms": summary["phase_avg_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay recorded games and report per-phase timing.")
+    parser.add_argument("recordings", nargs="*",
+                        help="recording files or directories of them")
+    parser.add_argument("--display", action="store_true",
+                        help="draw every tick instead of running headless")
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write the results to a JSON file")
+    parser.add_argument("--make-corpus", metavar="DIR",
+                        help="record random-agent games into DIR first")
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    paths = []
+    if args.make_corpus:
+        make_corpus(args.make_corpus, args.games, args.max_ticks, args.seed)
+        paths.append(Path(args.make_corpus))
+    paths += [Path(path) for path in args.recordings]
+
+    files = []
+    for path in paths:
+        files += sorted(path.glob("*.airp")) if path.is_dir() else [path]
+
+    results = [bench_recording(path, not args.display) for path in files]
+    for result in results:
+        phases = "  ".join(f"{phase} {ms:.3f}"
+                           for phase, ms in result["phase_avg_ms"].items()
+                           if ms)
+        flag = "" if result["deterministic"] else "  DIVERGED"
+        print(f"{result['recording']}: {result['ticks']} ticks"
+              f"  {result['ticks_per_second']:,.0f} ticks/s"
+              f"  p50/p95/p99 {result['step_p50_ms']:.3f}/"
+              f"{result['step_p95_ms']:.3f}/{result['step_p99_ms']:.3f} ms"
+              f"  [{phases}]{flag}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
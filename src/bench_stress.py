@@ -0,0 +1,155 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from settings import Settings
+
+FRAME_BUDGET_MS = 1000 / 60
+SUBSYSTEMS = ("_update_bullets", "_update_aliens",
+              "_check_bullet_alien_collisions", "_create_fleet",
+              "_update_screen")
+# what one frame runs; _update_bullets already includes the collisions
+FRAME_PARTS = ("_update_bullets", "_update_aliens", "_update_screen")
+
+
+def build_settings(scale, bullets, stars):
+    """Return Settings for a screen scale times the default size."""
+    settings = Settings()
+    settings.screen_width = int(settings.screen_width * scale)
+    settings.screen_height = int(settings.screen_height * scale)
+    settings.bullets_allowed = bullets
+    settings.star_count = stars
+    settings.respawn_pause = 0
+    return settings
+
+
+def build_scenario(scale, bullets, stars, seed):
+    """Create a headless game with a full fleet and every bullet in flight."""
+    from alien_invasion import AlienInvasion
+
+    game = AlienInvasion(headless=True, seed=seed,
+                         settings=build_settings(scale, bullets, stars))
+    game._start_game()
+    # the stars are drawn lazily; keep that out of the first frame's time
+    game._create_star()
+    return game
+
+
+def refill(game, rng):
+    """Reset the fleet and scatter the maximum number of bullets."""
+    game.bullets.empty()
+    game._create_fleet()
+    width, height = game.settings.screen_width, game.settings.screen_height
+    for _ in range(game.settings.bullets_allowed):
+        bullet = game.bullets.fire()
+        bullet.rect.midtop = (rng.randrange(width), rng.randrange(height))
+        bullet.y = float(bullet.rect.y)
+
+
+def time_subsystem(game, name, repeat, rng):
+    """Time one game method, resetting the scenario before every call."""
+    method = getattr(game, name)
+    samples = []
+    for _ in range(repeat):
+        refill(game, rng)
+        if name == "_update_screen":
+            # the first frame after a fleet rebuild is a full redraw
+            game.renderer.full_redraw = False
+        start = time.perf_counter()
+        method()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": statistics.median(samples),
+        "max_ms": max(samples),
+    }
+
+
+def run(scales, bullets, stars, repeat, seed, thresholds):
+    """Measure every subsystem at every scale and return the report."""
+    rng = random.Random(seed)
+    report = {"frame_budget_ms": FRAME_BUDGET_MS, "thresholds_ms": thresholds,
+              "scenarios": [], "first_over_budget": None}
+
+    for scale in scales:
+        game = build_scenario(scale, bullets, stars, seed)
+        scenario = {
+            "scale": scale,
+            "screen": [game.settings.screen_width,
+                       game.settings.screen_height],
+            "aliens": len(game.aliens),
+            "bullets": bullets,
+            "stars": stars,
+            "timings": {},
+            "over_threshold": [],
+        }
+        for name in SUBSYSTEMS:
+            timing = time_subsystem(game, name, repeat, rng)
+            scenario["timings"][name] = timing
+            if timing["p50_ms"] > thresholds.get(name, FRAME_BUDGET_MS):
+                scenario["over_threshold"].append(name)
+        scenario["frame_ms"] = sum(
+            scenario["timings"][name]["p50_ms"] for name in FRAME_PARTS)
+
+        # the subsystem with the largest share of the frame breaks first
+        if report["first_over_budget"] is None and \
+                scenario["frame_ms"] > FRAME_BUDGET_MS:
+            worst = max(FRAME_PARTS,
+                        key=lambda name: scenario["timings"][name]["p50_ms"])
+            report["first_over_budget"] = {"scale": scale, "subsystem": worst}
+        report["scenarios"].append(scenario)
+    return report
+
+
+def parse_thresholds(items):
+    """Turn NAME=MS arguments into a dictionary."""
+    thresholds = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        if name not in SUBSYSTEMS:
+            raise SystemExit(f"unknown subsystem {name!r}")
+        thresholds[name] = float(value)
+    return thresholds
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time game subsystems at growing scales under a dummy "
+                    "SDL driver.")
+    parser.add_argument("--scales", type=float, nargs="+",
+                        default=[1, 2, 3])
+    parser.add_argument("--bullets", type=int, default=100)
+    parser.add_argument("--stars", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--threshold", nargs="*", default=[],
+                        metavar="NAME=MS",
+                        help="per-subsystem limits (default: frame budget)")
+    parser.add_argument("--json", metavar="PATH",
+                        help="write the report here instead of stdout")
+    parser.add_argument("--fail", action="store_true",
+                        help="exit non-zero if any threshold is exceeded")
+    args = parser.parse_args()
+
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    # keep stdout clean for the JSON report
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    report = run(args.scales, args.bullets, args.stars, args.repeat,
+                 args.seed, parse_thresholds(args.threshold))
+
+    output = json.dumps(report, indent=2)
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.fail and any(s["over_threshold"] for s in report["scenarios"]):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,36 +1,154 @@
 import pygame
-from pygame.sprite import Sprite
 
 
-class Bullet(Sprite):
-    """A class to manage bullets fired from the ship."""
+class Bullet:
+    """A pooled bullet fired from the ship."""
+
+    __slots__ = ("pool", "rect", "y", "active")
+
+    def __init__(self, pool, width, height):
+        """Create an inactive bullet with its own rect."""
+        self.pool = pool
+        self.rect = pygame.Rect(0, 0, width, height)
+        self.y = 0.0
+        self.active = False
+
+    def kill(self):
+        """Hand the bullet back to its pool."""
+        if self.active:
+            self.pool.recycle(self)
+
+
+class BulletPool:
+    """A class to preallocate bullets and recycle them between shots.
+
+    Active bullets are kept in firing order. They all travel at the same
+    speed, so the ones that have left the screen are always at the front.
+    """
 
     def __init__(self, ai_game):
-        """Create a bullet object at the ship's current position."""
-        super().__init__()
-        self.screen = ai_game.screen
+        """Preallocate a bullet for every shot the settings allow."""
         self.settings = ai_game.settings
-        self.color = self.settings.bullet_color
+        self.ship = ai_game.ship
+
+        # every bullet is drawn by blitting this instead of filling a rect
+        self.image = None
+        self._prep_image()
+
+        self._free = [self._new_bullet()
+                      for _ in range(self.settings.bullets_allowed)]
+        self._active = []
+        self._stale = False
+
+        # pool statistics
+        self.fired = 0
+        self.recycled = 0
+        self.allocated = len(self._free)
+        self.peak = 0
+
+    def _prep_image(self):
+        """Render the bullet surface from the bullet settings."""
+        image = pygame.Surface(
+            (self.settings.bullet_width, self.settings.bullet_height))
+        image.fill(self.settings.bullet_color)
+        self.image = image.convert()
+
+    def restyle(self):
+        """Apply changed bullet size and color settings to every bullet."""
+        self._prep_image()
+        size = self.image.get_size()
+        for bullet in self._free + self.sprites():
+            # keep flying bullets centred where they were
+            center = bullet.rect.midtop
+            bullet.rect.size = size
+            bullet.rect.midtop = center
+            bullet.y = float(bullet.rect.y)
 
-        # create a bullet rect at (0, 0) and set the correct position
-        self.rect = pygame.Rect(0, 0, self.settings.bullet_width,
-                                self.settings.bullet_height)
-        self.rect.midtop = ai_game.ship.rect.midtop
-        # self.rect.midright = ai_game.ship.rect.midright
+    def _new_bullet(self):
+        return Bullet(self, self.settings.bullet_width,
+                      self.settings.bullet_height)
 
-        # store the bullet's position in a float
-        self.y = float(self.rect.y)
-        # self.x = float(self.rect.x)
+    def __len__(self):
+        return len(self.sprites())
+
+    def __bool__(self):
+        return bool(self.sprites())
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def sprites(self):
+        """Return the active bullets in firing order."""
+        if self._stale:
+            self._active = [bullet for bullet in self._active
+                            if bullet.active]
+            self._stale = False
+        return self._active
+
+    def fire(self):
+        """Launch a bullet from the ship; return it, or None if at the cap."""
+        active = self.sprites()
+        if len(active) >= self.settings.bullets_allowed:
+            return None
+        if self._free:
+            bullet = self._free.pop()
+        else:
+            # bullets_allowed was raised after the pool was created
+            bullet = self._new_bullet()
+            self.allocated += 1
+
+        bullet.rect.midtop = self.ship.rect.midtop
+        bullet.y = float(bullet.rect.y)
+        bullet.active = True
+        active.append(bullet)
+
+        self.fired += 1
+        self.peak = max(self.peak, len(active))
+        return bullet
+
+    def recycle(self, bullet):
+        """Return a bullet to the free list."""
+        bullet.active = False
+        self._free.append(bullet)
+        self._stale = True
+        self.recycled += 1
 
     def update(self):
-        """Move the bullet up the screen."""
-        # update the exact position of the bullet
-        self.y -= self.settings.bullet_speed
-        # self.x += self.settings.bullet_speed
-        # update the rect position
-        self.rect.y = self.y
-        # self.rect.x = self.x
-
-    def draw_bullet(self):
-        """Draw the bullet to the screen."""
-        pygame.draw.rect(self.screen, self.color, self.rect)
+        """Move every bullet up and recycle those that left the screen."""
+        active = self.sprites()
+        step = self.settings.bullet_speed * self.settings.step_scale
+        for bullet in active:
+            bullet.y -= step
+            bullet.rect.y = bullet.y
+
+        expired = 0
+        for bullet in active:
+            if bullet.rect.bottom > 0:
+                break
+            expired += 1
+        if expired:
+            for bullet in active[:expired]:
+                bullet.active = False
+            self._free.extend(active[:expired])
+            del active[:expired]
+            self.recycled += expired
+
+    def empty(self):
+        """Recycle every active bullet."""
+        for bullet in self.sprites():
+            bullet.active = False
+            self._free.append(bullet)
+            self.recycled += 1
+        self._active = []
+        self._stale = False
+
+    def report(self):
+        """Return the pool statistics as a dictionary."""
+        return {
+            "active": len(self.sprites()),
+            "free": len(self._free),
+            "allocated": self.allocated,
+            "fired": self.fired,
+            "recycled": self.recycled,
+            "peak": self.peak,
+        }
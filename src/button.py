@@ -1,4 +1,5 @@
-import pygame.font
+import pygame
+from text_cache import get_font
 
 
 class Button:
@@ -6,14 +7,13 @@ class Button:
 
     def __init__(self, ai_game, msg):
         """Initialize the button attributes."""
-        self.screen = ai_game.screen
-        self.screen_rect = self.screen.get_rect()
+        self.screen_rect = ai_game.screen_rect
 
         # Set the dimensions and properties of the button
         self.width, self.height = 200, 50
         self.button_color = (0, 135, 0)
         self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = get_font(48)
 
         # Build the button's rect object and center it.
         self.rect = pygame.Rect(0, 0, self.width, self.height)
@@ -26,10 +26,13 @@ class Button:
         """Turn msg into a rendered image and center text on button."""
         self.msg_image = self.font.render(msg, True, self.text_color,
                                           self.button_color)
-        self.msg_image_rect = self.msg_image.get_rect()
-        self.msg_image_rect.center = self.rect.center
 
-    def draw_button(self):
-        """Draw blank button and then draw message"""
-        self.screen.fill(self.button_color, self.rect)
-        self.screen.blit(self.msg_image, self.msg_image_rect)
\ No newline at end of file
+        # compose the finished button once for the renderer
+        self.image = pygame.Surface(self.rect.size)
+        self.image.fill(self.button_color)
+        self.image.blit(self.msg_image, self.msg_image.get_rect(
+            center=(self.width // 2, self.height // 2)))
+
+    def draw(self, renderer):
+        """Hand the composed button image to the renderer."""
+        renderer.draw_static("button", self.image, self.rect)
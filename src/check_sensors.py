@@ -1,55 +1,64 @@
-import subprocess
-import platform
 import time
+from pathlib import Path
 
+proc_stat = Path("/proc/stat")
+thermal_dir = Path("/sys/class/thermal")
 
 last_temp = None
 last_temp_time = 0
 
 
-def get_mac_temp():
-    """Fetch CPU temperature using istats."""
-    global last_temp, last_temp_time
-
-    # update temp once per second
-    if time.time() - last_temp_time < 1 and last_temp is not None:
-        return last_temp
+def read_cpu_times():
+    """Return (busy, total) jiffies for all CPUs from /proc/stat."""
     try:
-        # Try istats first
-        output = subprocess.check_output(["istats", "cpu"], encoding="utf-8")
-        temp_line = [line for line in output.split("\n") if "CPU temp" in line]
-        if temp_line:
-            celsius = float(temp_line[0].split(
-                ":")[1].strip().replace("°C", ""))
-            fahrenheit = (celsius * 9/5) + 32
-            last_temp = f"{fahrenheit:.1f}°F"
-            last_temp_time = time.time()
-            return last_temp
-
-        # Fallback to ioreg
-        output = subprocess.check_output(
-            ["ioreg", "-c", "AppleSMC"], encoding="utf-8")
-        temp_line = [line for line in output.split("\n") if "CPU Die" in line]
-        if temp_line:
-            temp_value = ''.join(
-                filter(str.isdigit, temp_line[0]))  # Extract numbers
-            celsius = int(temp_value) / 100  # Convert to Celsius
-            fahrenheit = (celsius * 9/5) + 32  # Convert to Fahrenheit
-            last_temp = f"{fahrenheit:.1f}°F"
-            last_temp_time = time.time()
-            return last_temp
-    except Exception:
-        return "N/A"
-    return "N/A"
-
-# print("CPU Temp:", get_mac_temp())
+        with open(proc_stat) as f:
+            fields = f.readline().split()[1:]
+    except OSError:
+        return None
+    values = [int(value) for value in fields]
+    # idle and iowait are the 4th and 5th columns
+    idle = values[3] + (values[4] if len(values) > 4 else 0)
+    total = sum(values)
+    return total - idle, total
 
 
-def get_cpu_temp():
-    """Fetch CPU Temperature (macOS-specific)"""
-    if platform.system() == "Darwin":  # macOS
-        return get_mac_temp()
-    return "N/A"
+class CpuUsage:
+    """A class to compute CPU usage between successive samples."""
+
+    def __init__(self):
+        self._last = read_cpu_times()
+        self.percent = None
+
+    def sample(self):
+        """Return CPU usage in percent since the previous sample."""
+        current = read_cpu_times()
+        if current is None or self._last is None:
+            return None
+        busy = current[0] - self._last[0]
+        total = current[1] - self._last[1]
+        if total > 0:
+            self.percent = 100 * busy / total
+            self._last = current
+        return self.percent
 
 
-print(f"CPU Temp: {get_mac_temp()}")
+def get_linux_temp():
+    """Return the hottest thermal zone in Celsius, or None."""
+    temps = []
+    for zone in thermal_dir.glob("thermal_zone*/temp"):
+        try:
+            temps.append(int(zone.read_text()) / 1000)
+        except (OSError, ValueError):
+            continue
+    return max(temps) if temps else None
+
+
+def get_cpu_temp():
+    """Fetch CPU temperature in Celsius, read at most once per second."""
+    global last_temp, last_temp_time
+
+    if time.time() - last_temp_time < 1:
+        return last_temp
+    last_temp = get_linux_temp()
+    last_temp_time = time.time()
+    return last_temp
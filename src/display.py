@@ -0,0 +1,98 @@
+import os
+import pygame  # type: ignore
+
+
+class Display:
+    """A class to own the window and present the game's logical canvas.
+
+    The game always simulates on a screen of screen_width x screen_height.
+    It is drawn on a canvas of that size times render_scale, and the canvas
+    is scaled to the window once per frame, either by SDL (pygame.SCALED)
+    or by one software scale blit. SDL picks the size of a SCALED window
+    itself, so a window_size is always scaled in software. Without scaling
+    the canvas is the window itself and frames are presented as before.
+    """
+
+    def __init__(self, settings):
+        """Open the window and create the canvas the game draws on."""
+        self.settings = settings
+        self.logical_size = (settings.screen_width, settings.screen_height)
+        # kept, as the canvas is sized for it until the next start
+        self.render_scale = settings.render_scale
+        self.canvas_size = (
+            max(1, round(settings.screen_width * settings.render_scale)),
+            max(1, round(settings.screen_height * settings.render_scale)))
+        smooth = settings.scale_filter == "smooth"
+        scaled = (settings.fullscreen or settings.window_size is not None
+                  or self.canvas_size != self.logical_size)
+
+        flags = pygame.FULLSCREEN if settings.fullscreen else 0
+        self.software = scaled and (not settings.gpu_scaling
+                                    or settings.window_size is not None)
+        if not scaled:
+            self.window = pygame.display.set_mode(self.logical_size, flags)
+            self.canvas = self.window
+        elif not self.software:
+            # SDL stretches the canvas to the window on the GPU; the hint
+            # has to be set before the renderer is created
+            os.environ["SDL_RENDER_SCALE_QUALITY"] = "1" if smooth else "0"
+            try:
+                self.window = pygame.display.set_mode(
+                    self.canvas_size, flags | pygame.SCALED)
+                self.canvas = self.window
+            except pygame.error:
+                # no SDL renderer is available; scale in software instead
+                self.software = True
+        if self.software:
+            # (0, 0) asks for the desktop size when fullscreen
+            window_size = settings.window_size or (
+                (0, 0) if settings.fullscreen else self.logical_size)
+            self.window = pygame.display.set_mode(window_size, flags)
+            self.canvas = pygame.Surface(self.canvas_size).convert()
+
+        self._scale = pygame.transform.smoothscale if smooth \
+            else pygame.transform.scale
+
+        # the largest rect with the canvas' aspect that fits the window;
+        # the bars around it stay black
+        self.target = self._fit(self.window.get_size())
+        self._target_surface = None
+        if self.software:
+            self.window.fill((0, 0, 0))
+            self._target_surface = self.window.subsurface(self.target)
+
+    def _fit(self, window_size):
+        width, height = window_size
+        canvas_width, canvas_height = self.canvas_size
+        factor = min(width / canvas_width, height / canvas_height)
+        rect = pygame.Rect(0, 0, round(canvas_width * factor),
+                           round(canvas_height * factor))
+        rect.center = (width // 2, height // 2)
+        return rect
+
+    def present(self, dirty=None):
+        """Show the canvas; dirty lists changed regions, None means all."""
+        if not self.software:
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+            return
+        if dirty is not None and not dirty:
+            return
+        # one scaled blit of the whole canvas straight into the window
+        self._scale(self.canvas, self.target.size, self._target_surface)
+        pygame.display.update(self.target)
+
+    def to_logical(self, position):
+        """Map a window position, e.g. a click, to logical coordinates."""
+        if not self.software:
+            # SCALED windows already report canvas coordinates
+            x, y = position
+        else:
+            x = (position[0] - self.target.x) * self.canvas_size[0] \
+                / self.target.w
+            y = (position[1] - self.target.y) * self.canvas_size[1] \
+                / self.target.h
+        scale = self.render_scale
+        return int(x / scale), int(y / scale)
@@ -0,0 +1,86 @@
+class FleetBounds:
+    """A class to track the fleet's extent without scanning every alien.
+
+    The fleet moves rigidly, so every alien in a column shares the same
+    x position and every alien in a row the same y position. The box is
+    read from one live alien in the outermost column or row, and those
+    only change when a column or row loses its last alien.
+    """
+
+    def __init__(self):
+        """Initialize an empty set of columns and rows."""
+        self.columns = {}
+        self.rows = {}
+        self._keys = {}
+        self._column_range = None
+        self._row_range = None
+
+    def rebuild(self, sprites):
+        """Group the fleet's aliens by column and row."""
+        self.columns = {}
+        self.rows = {}
+        self._keys = {}
+        for sprite in sprites:
+            column, row = sprite.rect.left, sprite.rect.top
+            self.columns.setdefault(column, {})[sprite] = None
+            self.rows.setdefault(row, {})[sprite] = None
+            self._keys[sprite] = (column, row)
+        self._update_ranges()
+
+    def _update_ranges(self):
+        """Find the outermost non-empty columns and rows."""
+        if self.columns:
+            self._column_range = (min(self.columns), max(self.columns))
+            self._row_range = (min(self.rows), max(self.rows))
+        else:
+            self._column_range = self._row_range = None
+
+    def remove(self, sprite):
+        """Drop a killed alien, updating the extent if it was the last."""
+        keys = self._keys.pop(sprite, None)
+        if keys is None:
+            return
+        column, row = keys
+        emptied = False
+        for groups, key in ((self.columns, column), (self.rows, row)):
+            members = groups[key]
+            del members[sprite]
+            if not members:
+                del groups[key]
+                emptied = True
+        if emptied:
+            self._update_ranges()
+
+    def _first(self, groups, key):
+        """Return the rect of any alien in a column or row."""
+        return next(iter(groups[key])).rect
+
+    @property
+    def left(self):
+        return self._first(self.columns, self._column_range[0]).left
+
+    @property
+    def right(self):
+        return self._first(self.columns, self._column_range[1]).right
+
+    @property
+    def top(self):
+        return self._first(self.rows, self._row_range[0]).top
+
+    @property
+    def bottom(self):
+        return self._first(self.rows, self._row_range[1]).bottom
+
+    def check(self, sprites):
+        """Compare the tracked box with a full scan of the fleet."""
+        rects = [sprite.rect for sprite in sprites]
+        if not rects:
+            if self.columns:
+                raise RuntimeError("fleet bounds track aliens that are gone")
+            return
+        expected = (min(r.left for r in rects), max(r.right for r in rects),
+                    min(r.top for r in rects), max(r.bottom for r in rects))
+        tracked = (self.left, self.right, self.top, self.bottom)
+        if tracked != expected:
+            raise RuntimeError(
+                f"fleet bounds {tracked} != scanned bounds {expected}")
@@ -0,0 +1,23 @@
+# grid positions already worked out, keyed by screen and alien size
+_templates = {}
+
+
+def fleet_template(screen_size, alien_size):
+    """Return the (x, y) of every alien in a fleet, computed only once.
+
+    Spacing between aliens is one alien width and one alien height, with
+    a margin of two alien heights kept free above the ship.
+    """
+    key = (tuple(screen_size), tuple(alien_size))
+    positions = _templates.get(key)
+    if positions is None:
+        screen_width, screen_height = key[0]
+        alien_width, alien_height = key[1]
+        positions = tuple(
+            (x, y)
+            for y in range(alien_height, screen_height - 3 * alien_height,
+                           2 * alien_height)
+            for x in range(alien_width, screen_width - 2 * alien_width,
+                           2 * alien_width))
+        _templates[key] = positions
+    return positions
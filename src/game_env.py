@@ -0,0 +1,196 @@
+import argparse
+import time
+import numpy as np
+import pygame  # type: ignore
+from alien_invasion import AlienInvasion
+from fleet_layout import fleet_template
+
+# actions are replay action bytes; every combination of the bits is valid
+ACTIONS = 8
+
+
+class GameEnv:
+    """A class to drive one headless game through reset() and step().
+
+    Observations are either a vector of positions ("vector") or the
+    rendered screen, downsampled ("pixels"). Nothing is drawn unless a
+    pixel observation or render() asks for it.
+    """
+
+    def __init__(self, seed=None, observation="vector", frame_skip=1,
+                 pixel_step=8, max_ticks=None, settings=None):
+        """Create the game and work out the observation layout."""
+        if observation not in ("vector", "pixels"):
+            raise ValueError(f"unknown observation type {observation!r}")
+        self.game = AlienInvasion(headless=True, seed=seed,
+                                  settings=settings)
+        self.observation = observation
+        self.frame_skip = frame_skip
+        self.pixel_step = pixel_step
+        self.max_ticks = max_ticks
+
+        settings = self.game.settings
+        self.width = settings.screen_width
+        self.height = settings.screen_height
+        # the vector has room for every bullet and a full fleet
+        self.max_bullets = settings.bullets_allowed
+        self.max_aliens = len(fleet_template(
+            (self.width, self.height),
+            self.game.assets.image("alien.bmp").get_size()))
+
+        self.ticks = 0
+        self._score = 0
+
+    @property
+    def observation_shape(self):
+        """Return the shape of the arrays step() returns."""
+        if self.observation == "pixels":
+            # pixels come from the canvas, which render_scale may shrink
+            width, height = self.game.screen.get_size()
+            step = self.pixel_step
+            return (-(-width // step), -(-height // step), 3)
+        return (3 + 2 * self.max_bullets + 2 * self.max_aliens,)
+
+    def reset(self):
+        """Start a new game and return the first observation."""
+        self.game._start_game()
+        self.ticks = 0
+        self._score = self.game.stats.score
+        return self._observe()
+
+    def step(self, action):
+        """Apply an action byte for frame_skip ticks.
+
+        Returns (observation, reward, done, info); the reward is the score
+        gained and done is set once the last ship is lost.
+        """
+        game = self.game
+        for _ in range(self.frame_skip):
+            game._step(action)
+            self.ticks += 1
+            if not game.game_active:
+                break
+
+        stats = game.stats
+        reward = stats.score - self._score
+        self._score = stats.score
+        done = not game.game_active
+        truncated = (self.max_ticks is not None
+                     and self.ticks >= self.max_ticks)
+        info = {"ticks": self.ticks, "score": stats.score,
+                "level": stats.level, "ships_left": stats.ships_left,
+                "truncated": truncated and not done}
+        return self._observe(), reward, done or truncated, info
+
+    def render(self):
+        """Draw the game and return a copy of the screen's pixels."""
+        self._draw()
+        return pygame.surfarray.array3d(self.game.screen)
+
+    def _draw(self):
+        game = self.game
+        # envs in one process share the display surface, so repaint all of
+        # it from this game's own background
+        game.renderer.full_redraw = True
+        game._update_screen()
+
+    def _observe(self):
+        if self.observation == "pixels":
+            return self._observe_pixels()
+        return self._observe_vector()
+
+    def _observe_pixels(self):
+        self._draw()
+        # pixels3d is a view of the screen; only the sampled pixels are
+        # copied, which also releases the surface lock
+        view = pygame.surfarray.pixels3d(self.game.screen)
+        step = self.pixel_step
+        pixels = np.array(view[::step, ::step])
+        del view
+        return pixels
+
+    def _observe_vector(self):
+        """Return ship x and the bullet and alien positions, in 0..1."""
+        game = self.game
+        vector = np.zeros(self.observation_shape, dtype=np.float32)
+        scale = np.array((self.width, self.height), dtype=np.float32)
+
+        bullets = game.bullets.sprites()[:self.max_bullets]
+        aliens = game.aliens.sprites()[:self.max_aliens]
+        vector[0] = game.ship.rect.centerx / self.width
+        vector[1] = len(bullets) / self.max_bullets
+        vector[2] = len(aliens) / self.max_aliens
+
+        # unused slots stay at zero; the counts say how many are filled
+        start = 3
+        if bullets:
+            positions = np.array([bullet.rect.center for bullet in bullets])
+            vector[start:start + positions.size] = (positions / scale).ravel()
+        start += 2 * self.max_bullets
+        if aliens:
+            positions = np.array([alien.rect.center for alien in aliens])
+            vector[start:start + positions.size] = (positions / scale).ravel()
+        return vector
+
+
+class VectorEnv:
+    """A class to step several environments in lockstep.
+
+    Finished environments are reset straight away; the observation that
+    ended their game is kept in info["final_observation"].
+    """
+
+    def __init__(self, count, seed=0, **kwargs):
+        """Create count environments with consecutive seeds."""
+        self.envs = [GameEnv(seed=seed + number, **kwargs)
+                     for number in range(count)]
+
+    def __len__(self):
+        return len(self.envs)
+
+    def reset(self):
+        """Reset every environment and return the stacked observations."""
+        return np.stack([env.reset() for env in self.envs])
+
+    def step(self, actions):
+        """Step each environment with its action; return stacked results."""
+        observations, rewards, dones, infos = [], [], [], []
+        for env, action in zip(self.envs, actions):
+            observation, reward, done, info = env.step(int(action))
+            if done:
+                info["final_observation"] = observation
+                observation = env.reset()
+            observations.append(observation)
+            rewards.append(reward)
+            dones.append(done)
+            infos.append(info)
+        return (np.stack(observations), np.array(rewards),
+                np.array(dones), infos)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Step vectorised environments with random actions.")
+    parser.add_argument("--envs", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--observation", choices=("vector", "pixels"),
+                        default="vector")
+    parser.add_argument("--frame-skip", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    envs = VectorEnv(args.envs, seed=args.seed, observation=args.observation,
+                     frame_skip=args.frame_skip)
+    observations = envs.reset()
+    start = time.perf_counter()
+    episodes = 0
+    for _ in range(args.steps):
+        actions = rng.integers(ACTIONS, size=len(envs))
+        observations, rewards, dones, infos = envs.step(actions)
+        episodes += int(dones.sum())
+    elapsed = time.perf_counter() - start
+    steps = args.steps * len(envs)
+    print(f"observation {observations.shape[1:]}  {steps / elapsed:,.0f} "
+          f"env steps/s  {steps * args.frame_skip / elapsed:,.0f} ticks/s"
+          f"  episodes finished: {episodes}")
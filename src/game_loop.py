@@ -0,0 +1,34 @@
+import time
+
+
+class FixedStepLoop:
+    """A class to run the simulation at a fixed rate between frames."""
+
+    def __init__(self, settings):
+        """Initialize the accumulator and the step counters."""
+        self.settings = settings
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.steps = 0
+        self.dropped_time = 0.0
+        self._last = time.perf_counter()
+
+    def advance(self):
+        """Return how many simulation steps are due since the last call."""
+        step_time = 1 / self.settings.sim_hz
+        now = time.perf_counter()
+        self.accumulator += now - self._last
+        self._last = now
+
+        steps = int(self.accumulator / step_time)
+        # drop time we can't catch up on instead of spiralling
+        if steps > self.settings.max_steps_per_frame:
+            self.dropped_time += (steps - self.settings.max_steps_per_frame) \
+                * step_time
+            steps = self.settings.max_steps_per_frame
+            self.accumulator = steps * step_time
+
+        self.accumulator -= steps * step_time
+        self.alpha = self.accumulator / step_time
+        self.steps += steps
+        return steps
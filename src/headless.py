@@ -0,0 +1,82 @@
+import argparse
+import random
+import time
+from alien_invasion import AlienInvasion
+from replay import encode_actions
+
+
+class HeadlessGame:
+    """A class to step the game logic programmatically, without a window."""
+
+    def __init__(self, seed=None):
+        """Create a headless game instance and reset the counters."""
+        self.game = AlienInvasion(headless=True, seed=seed)
+        self.ticks = 0
+        self.elapsed = 0.0
+
+    def reset(self):
+        """Start a new game."""
+        self.game._start_game()
+
+    def step(self, left=False, right=False, fire=False):
+        """Apply one tick of input, advance one step and report if alive."""
+        game = self.game
+        game._step(encode_actions(left, right, fire))
+        self.ticks += 1
+        return game.game_active
+
+    def run(self, max_ticks, agent=None):
+        """Step until the game ends or max_ticks pass; return the ticks."""
+        agent = agent or idle_agent
+        start = time.perf_counter()
+        ticks = 0
+        while ticks < max_ticks:
+            ticks += 1
+            if not self.step(*agent(self.game)):
+                break
+        self.elapsed += time.perf_counter() - start
+        return ticks
+
+    @property
+    def ticks_per_second(self):
+        """Return the simulation speed measured so far."""
+        return self.ticks / self.elapsed if self.elapsed else 0.0
+
+
+def idle_agent(game):
+    """Never move or shoot."""
+    return False, False, False
+
+
+def random_agent(game, rng=random):
+    """Pick a random direction and fire about a third of the time."""
+    direction = rng.randrange(3)
+    return direction == 1, direction == 2, rng.random() < 0.3
+
+
+def hunter_agent(game):
+    """Chase the lowest alien and fire constantly."""
+    aliens = game.aliens.sprites()
+    if not aliens:
+        return False, False, True
+    ship_x = game.ship.rect.centerx
+    target = max(aliens, key=lambda alien: (
+        alien.rect.bottom, -abs(alien.rect.centerx - ship_x))).rect.centerx
+    return target < ship_x - 4, target > ship_x + 4, True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Run Alien Invasion headless and report ticks/second.")
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    headless = HeadlessGame(seed=args.seed)
+    headless.reset()
+    headless.run(args.ticks, lambda game: random_agent(game, rng))
+    stats = headless.game.stats
+    print(f"ticks: {headless.ticks}  ticks/s: {headless.ticks_per_second:,.0f}"
+          f"  score: {stats.score}  level: {stats.level}"
+          f"  ships left: {stats.ships_left}")
@@ -0,0 +1,149 @@
+from collections import deque
+import pygame  # type: ignore
+
+# action -> keys that trigger it; settings.key_bindings overrides entries
+DEFAULT_BINDINGS = {
+    "left": ("left",),
+    "right": ("right",),
+    "fire": ("space",),
+    "start": ("p",),
+    "quit": ("q",),
+    "profiler": ("f3",),
+    "export_profile": ("f4",),
+}
+
+# everything else, mouse motion included, is dropped by SDL before it
+# reaches the queue
+ALLOWED_EVENTS = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.WINDOWFOCUSLOST,
+    pygame.WINDOWEXPOSED,
+)
+
+
+def event_types():
+    """Return every event type pygame has a name for."""
+    return sorted({value for name, value in vars(pygame).items()
+                   if name.isupper() and isinstance(value, int)
+                   and 0 < value < pygame.USEREVENT
+                   and pygame.event.event_name(value) != "Unknown"})
+
+
+def key_event(key, down=True):
+    """Return a synthetic key event, for injecting input."""
+    if isinstance(key, str):
+        key = pygame.key.key_code(key)
+    return pygame.event.Event(pygame.KEYDOWN if down else pygame.KEYUP,
+                              key=key)
+
+
+class InputHandler:
+    """A class to turn the event queue into held and triggered actions.
+
+    Key state is kept from KEYDOWN and KEYUP events, so nothing has to ask
+    SDL for the keyboard state each frame.
+    """
+
+    def __init__(self, bindings=None, source=None):
+        """Initialize the bindings and an empty action state.
+
+        source is a callable returning the pending events; it defaults to
+        the pygame event queue.
+        """
+        self.source = source or pygame.event.get
+        self._keys = {}
+        self._bindings = {}
+        for action, keys in DEFAULT_BINDINGS.items():
+            self.bind(action, *keys)
+        for action, keys in (bindings or {}).items():
+            self.bind(action, *keys)
+
+        # keys currently down, and the held actions they map to
+        self._down = set()
+        self._held = {}
+        # events queued by inject(), read before the source
+        self._injected = deque()
+
+        # per-poll results
+        self.triggered = []
+        self.clicks = []
+        self.quit = False
+        self.exposed = False
+
+    def install(self):
+        """Let only the event types the game handles into the queue."""
+        # set_blocked(None) walks every possible type, which takes ~20ms,
+        # so block just the types pygame defines
+        pygame.event.set_blocked(event_types())
+        pygame.event.set_allowed(ALLOWED_EVENTS)
+
+    def bind(self, action, *keys):
+        """Bind action to keys, given as key codes or names like "a"."""
+        for key in self._bindings.get(action, ()):
+            self._keys.pop(key, None)
+        codes = tuple(pygame.key.key_code(key) if isinstance(key, str)
+                      else key for key in keys)
+        self._bindings[action] = codes
+        for code in codes:
+            self._keys[code] = action
+
+    def bindings(self):
+        """Return the key codes bound to each action."""
+        return dict(self._bindings)
+
+    def inject(self, *events):
+        """Queue events to be handled by the next poll."""
+        self._injected.extend(events)
+
+    def held(self, action):
+        """Return True while a key bound to action is down."""
+        return self._held.get(action, 0) > 0
+
+    def release_all(self):
+        """Forget every held key, e.g. when the window loses focus."""
+        self._down.clear()
+        self._held.clear()
+
+    def poll(self):
+        """Handle pending events and return the actions they triggered."""
+        self.triggered = []
+        self.clicks = []
+        self.quit = False
+        self.exposed = False
+
+        injected = self._injected
+        while injected:
+            self._handle(injected.popleft())
+        for event in self.source():
+            self._handle(event)
+        return self.triggered
+
+    def _handle(self, event):
+        match event.type:
+            case pygame.KEYDOWN:
+                if event.key in self._down:
+                    return
+                self._down.add(event.key)
+                action = self._keys.get(event.key)
+                if action is not None:
+                    self._held[action] = self._held.get(action, 0) + 1
+                    self.triggered.append(action)
+            case pygame.KEYUP:
+                if event.key not in self._down:
+                    return
+                self._down.discard(event.key)
+                action = self._keys.get(event.key)
+                if action is not None and self._held.get(action):
+                    self._held[action] -= 1
+            case pygame.MOUSEBUTTONDOWN:
+                self.clicks.append(event.pos)
+            case pygame.QUIT:
+                self.quit = True
+            case pygame.WINDOWFOCUSLOST:
+                # key-ups are not delivered to an unfocused window
+                self.release_all()
+            case pygame.WINDOWEXPOSED:
+                self.exposed = True
@@ -0,0 +1,177 @@
+import csv
+import gc
+import json
+import sys
+import time
+from collections import deque
+import pygame  # type: ignore
+from check_sensors import CpuUsage, get_cpu_temp
+from text_cache import get_font
+
+PHASES = ("events", "ship", "bullets", "aliens", "render")
+
+
+def percentile(values, fraction):
+    """Return the value at a fraction of the way through sorted values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(fraction * len(ordered)))
+    return ordered[index]
+
+
+class FrameProfiler:
+    """A class to time each phase of a frame and keep rolling stats."""
+
+    def __init__(self, ai_game):
+        """Initialize the rolling history and the overlay state."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.enabled = self.settings.profiler_enabled
+        self.visible = False
+
+        history = self.settings.profiler_history
+        self.frames = deque(maxlen=history)
+        self.rows = deque(maxlen=history)
+        self._phase_times = dict.fromkeys(PHASES, 0.0)
+        self._frame_start = None
+        self._blocks = sys.getallocatedblocks()
+
+        # overlay text is re-rendered a few times a second at most
+        self.font = get_font(24)
+        self.text_color = (255, 255, 255)
+        self.image = None
+        self.rect = None
+        self.dirty = False
+        self._last_refresh = 0.0
+
+        self.cpu = CpuUsage()
+        self.cpu_percent = None
+        self.cpu_temp = None
+
+    def measure(self, phase, func, *args):
+        """Call func, adding its duration to this frame's phase total."""
+        if not self.enabled:
+            return func(*args)
+        start = time.perf_counter()
+        result = func(*args)
+        self._phase_times[phase] += time.perf_counter() - start
+        return result
+
+    def end_frame(self):
+        """Close the current frame and record its timings."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            frame_ms = (now - self._frame_start) * 1000
+            blocks = sys.getallocatedblocks()
+            row = {phase: self._phase_times[phase] * 1000
+                   for phase in PHASES}
+            row["frame"] = frame_ms
+            row["alloc_blocks"] = blocks - self._blocks
+            row["gc_gen0"] = gc.get_count()[0]
+            row["alien_count"] = len(self.ai_game.aliens)
+            row["bullet_count"] = len(self.ai_game.bullets)
+            row["draw_calls"] = self.ai_game.renderer.draw_calls
+            self.rows.append(row)
+            self.frames.append(frame_ms)
+            self._blocks = blocks
+        self._frame_start = now
+        self._phase_times = dict.fromkeys(PHASES, 0.0)
+
+        if self.visible and now - self._last_refresh >= \
+                self.settings.profiler_refresh:
+            self._last_refresh = now
+            self._prep_overlay()
+
+    def summary(self):
+        """Return rolling frame-time percentiles and phase averages."""
+        rows = list(self.rows)
+        count = len(rows) or 1
+        return {
+            "frames": len(rows),
+            "frame_p50_ms": percentile(self.frames, 0.50),
+            "frame_p95_ms": percentile(self.frames, 0.95),
+            "frame_p99_ms": percentile(self.frames, 0.99),
+            "phase_avg_ms": {phase: sum(row[phase] for row in rows) / count
+                             for phase in PHASES},
+            "alloc_blocks_avg": sum(row["alloc_blocks"] for row in rows)
+            / count,
+            "alien_count": len(self.ai_game.aliens),
+            "bullet_count": len(self.ai_game.bullets),
+            "draw_calls": self.ai_game.renderer.draw_calls,
+            "layers": self.ai_game.renderer.report()["layers"],
+            "cpu_percent": self.cpu_percent,
+            "cpu_temp_c": self.cpu_temp,
+        }
+
+    def toggle(self):
+        """Show or hide the overlay, enabling timing while it is shown."""
+        self.visible = not self.visible
+        if self.visible:
+            self.enabled = True
+            self._last_refresh = 0.0
+        self.dirty = True
+
+    def _prep_overlay(self):
+        """Render the stats into one cached surface."""
+        self.cpu_percent = self.cpu.sample()
+        self.cpu_temp = get_cpu_temp()
+        stats = self.summary()
+
+        cpu = "n/a" if self.cpu_percent is None else \
+            f"{self.cpu_percent:.0f}%"
+        temp = "n/a" if self.cpu_temp is None else f"{self.cpu_temp:.0f}C"
+        lines = [
+            f"FPS: {self.ai_game.clock.get_fps():.1f}",
+            f"frame p50/p95/p99: {stats['frame_p50_ms']:.1f}/"
+            f"{stats['frame_p95_ms']:.1f}/{stats['frame_p99_ms']:.1f} ms",
+        ]
+        lines += [f"{phase}: {ms:.2f} ms"
+                  for phase, ms in stats["phase_avg_ms"].items()]
+        lines += [
+            f"aliens: {stats['alien_count']}  "
+            f"bullets: {stats['bullet_count']}",
+            f"draw calls: {stats['draw_calls']}  " + "  ".join(
+                f"{layer} {layer_stats['ms']:.2f} ms"
+                for layer, layer_stats in stats["layers"].items()),
+            f"alloc blocks/frame: {stats['alloc_blocks_avg']:.0f}",
+            f"CPU: {cpu}  temp: {temp}",
+        ]
+
+        images = [self.font.render(line, True, self.text_color,
+                                   self.settings.bg_color) for line in lines]
+        width = max(image.get_width() for image in images)
+        height = sum(image.get_height() for image in images)
+        self.image = pygame.Surface((width, height))
+        self.image.fill(self.settings.bg_color)
+        y = 0
+        for image in images:
+            self.image.blit(image, (0, y))
+            y += image.get_height()
+        self.rect = self.image.get_rect(topleft=(10, 10))
+        self.dirty = True
+
+    def draw(self, renderer):
+        """Hand the overlay to the renderer while it is visible."""
+        if self.visible and self.image is not None:
+            renderer.draw_static("profiler", self.image, self.rect,
+                                 self.dirty)
+        self.dirty = False
+
+    def export_csv(self, path):
+        """Write every recorded frame to a CSV file."""
+        rows = list(self.rows)
+        if not rows:
+            return
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def export_json(self, path):
+        """Write the summary and every recorded frame to a JSON file."""
+        with open(path, "w") as f:
+            json.dump({"summary": self.summary(), "frames": list(self.rows)},
+                      f, indent=2)
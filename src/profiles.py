@@ -0,0 +1,328 @@
+import json
+import os
+import time
+import warnings
+from pathlib import Path
+import pygame  # type: ignore
+from input_handler import DEFAULT_BINDINGS
+from settings import Settings
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11; JSON profiles still work
+    tomllib = None
+
+# named sets of values a profile can start from with "preset = NAME"
+PRESETS = {
+    "low-end": {
+        "render_scale": 0.5,
+        "scale_filter": "nearest",
+        "star_count": 300,
+        "max_fps": 30,
+        "sim_hz": 60,
+        "bullets_allowed": 20,
+    },
+    "stress": {
+        "bullets_allowed": 1000,
+        "star_count": 5000,
+        "star_layers": 3,
+        "star_scroll_speed": 1.0,
+        "array_fleet": True,
+        "max_fps": 0,
+        "profiler_enabled": True,
+    },
+}
+
+# settings whose default is None, and the type they take otherwise
+NULLABLE = {
+    "window_size": tuple,
+    "star_seed": int,
+    "record_path": str,
+    "score_db_path": str,
+    "profile_path": str,
+}
+# whole-number defaults that may also be set to fractions
+FRACTIONAL = {"star_scroll_speed", "bullet_speed"}
+CHOICES = {"scale_filter": ("nearest", "smooth")}
+POSITIVE = {"screen_width", "screen_height", "base_hz", "sim_hz",
+            "max_steps_per_frame", "render_scale", "ship_limit",
+            "bullet_width", "bullet_height", "bullets_allowed", "star_layers",
+            "audio_frequency", "audio_buffer", "profiler_history",
+            "profile_poll"}
+NON_NEGATIVE = {"max_fps", "respawn_pause", "star_scroll_speed",
+                "star_count", "star_radius", "profiler_refresh"}
+# state the game keeps in Settings that a profile must not set
+NOT_SETTINGS = {"fleet_direction", "dynamic_overrides"}
+# set again by initialize_dynamic_settings() at every reset
+DYNAMIC = {"ship_speed", "bullet_speed", "alien_speed", "alien_points"}
+# used once to build the window, the fleet layout or a subsystem, so a
+# change only takes effect on the next start
+RESTART = {"screen_width", "screen_height", "window_size", "fullscreen",
+           "scale_filter", "gpu_scaling", "render_scale", "array_fleet",
+           "threaded_render", "audio_frequency", "audio_size",
+           "audio_channels", "audio_buffer", "sound_voices", "score_db_path",
+           "profiler_history", "profile_path"}
+
+
+class ProfileError(ValueError):
+    """A profile file that can't be read or doesn't match the schema."""
+
+
+def _schema():
+    """Return the expected type of every setting, from the defaults."""
+    schema = {}
+    for name, value in vars(Settings()).items():
+        if name in NOT_SETTINGS:
+            continue
+        if value is None:
+            schema[name] = NULLABLE[name]
+        else:
+            schema[name] = float if name in FRACTIONAL else type(value)
+    return schema
+
+
+SCHEMA = _schema()
+
+
+def _check(name, value, expected):
+    """Return the value converted to the setting's type, or raise."""
+    if value is None and name in NULLABLE:
+        return None
+    if expected is float and isinstance(value, int) \
+            and not isinstance(value, bool):
+        value = float(value)
+    if expected is tuple and isinstance(value, list):
+        default = getattr(Settings(), name)
+        if default is not None and len(value) != len(default):
+            raise ProfileError(f"{name}: expected {len(default)} values")
+        value = tuple(value)
+    if expected is dict and isinstance(value, dict):
+        # key bindings are stored as tuples of key names
+        value = {key: tuple(item) if isinstance(item, list) else item
+                 for key, item in value.items()}
+    if type(value) is not expected:
+        raise ProfileError(f"{name}: expected {expected.__name__}, "
+                           f"got {type(value).__name__}")
+    if name in CHOICES and value not in CHOICES[name]:
+        raise ProfileError(f"{name}: must be one of {CHOICES[name]}")
+    if name in POSITIVE and value <= 0:
+        raise ProfileError(f"{name}: must be positive")
+    if name in NON_NEGATIVE and value < 0:
+        raise ProfileError(f"{name}: must not be negative")
+    _check_items(name, value)
+    return value
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_key(action, key):
+    if _is_int(key):
+        return
+    if not isinstance(key, str):
+        raise ProfileError(f"key_bindings: {action}: expected key names")
+    # key names don't depend on the display, which may not be up yet
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            pygame.key.key_code(key)
+        except ValueError:
+            raise ProfileError(
+                f"key_bindings: {action}: unknown key {key!r}") from None
+
+
+def _check_items(name, value):
+    """Check the values inside colors, sizes and tables of a setting."""
+    if name.endswith("_color"):
+        if len(value) != 3 or not all(_is_int(channel) and 0 <= channel <= 255
+                                      for channel in value):
+            raise ProfileError(f"{name}: expected three ints from 0 to 255")
+    elif name == "window_size" and value is not None:
+        if not all(_is_int(side) and side > 0 for side in value):
+            raise ProfileError(f"{name}: expected two positive ints")
+    elif name == "key_bindings":
+        for action, keys in value.items():
+            if action not in DEFAULT_BINDINGS:
+                raise ProfileError(f"{name}: unknown action {action!r}")
+            if not isinstance(keys, tuple):
+                raise ProfileError(f"{name}: {action}: expected a list of "
+                                   "keys")
+            for key in keys:
+                _check_key(action, key)
+    elif name == "sound_voices":
+        for sound, voices in value.items():
+            if not _is_int(voices) or voices <= 0:
+                raise ProfileError(f"{name}: {sound}: expected a positive "
+                                   "int")
+
+
+def validate(values):
+    """Check a profile's values against the schema; return them converted.
+
+    Every problem is collected so one error lists them all.
+    """
+    values = dict(values)
+    preset = values.pop("preset", None)
+    if preset is not None:
+        if preset not in PRESETS:
+            raise ProfileError(f"unknown preset {preset!r}; choose from "
+                               f"{', '.join(PRESETS)}")
+        values = {**PRESETS[preset], **values}
+
+    checked, problems = {}, []
+    for name, value in values.items():
+        if name not in SCHEMA:
+            problems.append(f"{name}: unknown setting")
+            continue
+        try:
+            checked[name] = _check(name, value, SCHEMA[name])
+        except ProfileError as error:
+            problems.append(str(error))
+    if problems:
+        raise ProfileError("; ".join(problems))
+    return checked
+
+
+def read_profile(path):
+    """Read and validate a JSON or TOML profile file."""
+    path = Path(path)
+    try:
+        if path.suffix == ".toml":
+            if tomllib is None:
+                raise ProfileError("TOML profiles need Python 3.11+")
+            with open(path, "rb") as f:
+                values = tomllib.load(f)
+        else:
+            with open(path) as f:
+                values = json.load(f)
+    except (OSError, ValueError) as error:
+        raise ProfileError(f"{path}: {error}") from error
+    if not isinstance(values, dict):
+        raise ProfileError(f"{path}: expected a table of settings")
+    return validate(values)
+
+
+def apply_profile(settings, values):
+    """Set validated values on settings; return the names that changed."""
+    changed = set()
+    for name, value in values.items():
+        if name in DYNAMIC:
+            settings.dynamic_overrides[name] = value
+        if getattr(settings, name) != value:
+            setattr(settings, name, value)
+            changed.add(name)
+    return changed
+
+
+def load_settings(path=None, preset=None):
+    """Return Settings with a preset and then a profile file applied."""
+    settings = Settings()
+    if preset is not None:
+        apply_profile(settings, validate({"preset": preset}))
+    if path is not None:
+        apply_profile(settings, read_profile(path))
+        settings.profile_path = str(path)
+    return settings
+
+
+class ProfileWatcher:
+    """A class to reload the profile file when it changes on disk.
+
+    check() is called between frames; it only stats the file, and at most
+    every profile_poll seconds.
+    """
+
+    def __init__(self, ai_game):
+        """Remember the profile's current modification stamp."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.path = self.settings.profile_path
+        self._next_check = 0.0
+        self._stamp = self._read_stamp()
+        # settings the file sets; ones removed from it go back to default
+        try:
+            self._applied = set(read_profile(self.path))
+        except ProfileError:
+            self._applied = set()
+        # restart-only values from the file that aren't in use yet
+        self.pending = {}
+        # the outcome of the last reload
+        self.last_reload = None
+
+    def _read_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self):
+        """Reload the profile if its file changed; return True if so."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.settings.profile_poll
+        stamp = self._read_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        if self.ai_game.recorder is not None:
+            # a recording only keeps the settings its game started with;
+            # the edit is picked up once the game is over
+            return False
+        self._stamp = stamp
+        self.reload()
+        return True
+
+    def reload(self):
+        """Apply the profile again and invalidate what depends on it."""
+        start = time.perf_counter()
+        try:
+            values = read_profile(self.path)
+        except ProfileError as error:
+            # keep playing with the settings already in use
+            self.last_reload = {"error": str(error)}
+            print(f"profile not reloaded: {error}")
+            return self.last_reload
+
+        applied = set(values)
+        removed = self._applied - applied
+        defaults = Settings()
+        for name in removed:
+            values[name] = getattr(defaults, name)
+        # the window, canvas and subsystems were built from these; they
+        # wait for the next start instead of being changed under them
+        restart = {name: values.pop(name) for name in list(values)
+                   if name in RESTART}
+        previous = {name: getattr(self.settings, name) for name in values}
+        overrides = dict(self.settings.dynamic_overrides)
+        changed = apply_profile(self.settings, values)
+        for name in removed:
+            self.settings.dynamic_overrides.pop(name, None)
+
+        try:
+            invalidated = self.ai_game._settings_changed(changed)
+        except (ValueError, pygame.error) as error:
+            # put the old values back and rebuild from them
+            for name, value in previous.items():
+                setattr(self.settings, name, value)
+            self.settings.dynamic_overrides = overrides
+            self.ai_game._settings_changed(changed)
+            self.last_reload = {"error": str(error)}
+            print(f"profile not reloaded: {error}")
+            return self.last_reload
+        self._applied = applied
+        self.pending = {name: value for name, value in restart.items()
+                        if getattr(self.settings, name) != value}
+        self.last_reload = {
+            "changed": sorted(changed),
+            "invalidated": invalidated,
+            "needs_restart": sorted(self.pending),
+            "ms": (time.perf_counter() - start) * 1000,
+        }
+        print(f"profile reloaded in {self.last_reload['ms']:.1f}ms: "
+              f"changed {', '.join(sorted(changed)) or 'nothing'}"
+              + (f"; rebuilt {', '.join(invalidated)}" if invalidated else "")
+              + (f"; restart to apply {', '.join(sorted(self.pending))}"
+                 if self.pending else ""))
+        return self.last_reload
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import deque
+
+
+class DrawList:
+    """A class to record one frame's renderer calls as a snapshot.
+
+    It has the renderer's drawing methods, so the game draws into it the
+    same way it draws into the renderer. Rects are copied, so the game
+    state can move on while the snapshot is composed.
+    """
+
+    def __init__(self):
+        """Start an empty snapshot stamped with the time it was taken."""
+        self.created = time.perf_counter()
+        self.commands = []
+
+    def set_background(self, starfield, offsets=None):
+        # the scroll offsets keep changing on the simulation thread
+        self.commands.append(("set_background", starfield,
+                              tuple(starfield.offsets if offsets is None
+                                    else offsets)))
+
+    def begin_frame(self):
+        self.commands.append(("begin_frame",))
+
+    def draw_batch(self, layer, items):
+        self.commands.append(("draw_batch", layer,
+                              [(key, image, rect.copy())
+                               for key, image, rect in items]))
+
+    def draw_static(self, key, image, rect, dirty=False):
+        self.commands.append(("draw_static", key, image, rect.copy(), dirty))
+
+    def end_frame(self):
+        # presenting is left to the main thread
+        self.commands.append(("end_frame", False))
+
+    def replay(self, renderer):
+        """Make every recorded call on a real renderer."""
+        for name, *args in self.commands:
+            getattr(renderer, name)(*args)
+
+
+class RenderPipeline:
+    """A class to compose frames on a worker thread.
+
+    The main thread hands over a snapshot and keeps simulating while the
+    worker blits it; the frame is presented at the start of the next
+    render, so it shows one frame later than in the serial loop. pygame
+    releases the GIL during blits, so composing overlaps the simulation.
+    """
+
+    def __init__(self, renderer, history=600):
+        """Start the worker thread with an empty double buffer."""
+        self.renderer = renderer
+        # the buffer being composed and the one the game fills next
+        self._front = None
+        self._composed = threading.Event()
+        self._composed.set()
+        self._submitted = threading.Condition()
+        self._error = None
+        self._running = True
+
+        # seconds from taking a snapshot to presenting it
+        self.latencies = deque(maxlen=history)
+        self.frames = 0
+
+        self._worker = threading.Thread(target=self._compose_loop,
+                                        daemon=True)
+        self._worker.start()
+
+    def present(self):
+        """Wait for the last snapshot to be composed and present it."""
+        self._composed.wait()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        snapshot, self._front = self._front, None
+        if snapshot is not None:
+            self.renderer.present()
+            self.latencies.append(time.perf_counter() - snapshot.created)
+            self.frames += 1
+
+    def submit(self, snapshot):
+        """Hand a snapshot to the worker to compose."""
+        self._composed.wait()
+        with self._submitted:
+            self._composed.clear()
+            self._front = snapshot
+            self._submitted.notify()
+
+    def wait(self):
+        """Block until the worker has finished the frame it is composing."""
+        self._composed.wait()
+
+    def stop(self):
+        """Finish the frame in progress and stop the worker."""
+        self._composed.wait()
+        with self._submitted:
+            self._running = False
+            self._submitted.notify()
+        self._worker.join()
+
+    def _compose_loop(self):
+        while True:
+            with self._submitted:
+                while self._composed.is_set() and self._running:
+                    self._submitted.wait()
+                if not self._running:
+                    return
+                snapshot = self._front
+            try:
+                snapshot.replay(self.renderer)
+            except Exception as error:
+                # raised again on the main thread by present()
+                self._error = error
+            self._composed.set()
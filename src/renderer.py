@@ -0,0 +1,220 @@
+import time
+import weakref
+import pygame  # type: ignore
+
+
+class DirtyRenderer:
+    """A class to redraw and push only the screen regions that changed."""
+
+    def __init__(self, ai_game):
+        """Initialize the cached background and the rect bookkeeping."""
+        self.screen = ai_game.screen
+        self.display = ai_game.display
+        self.settings = ai_game.settings
+
+        # objects arrive in logical coordinates; a canvas drawn at a lower
+        # resolution gets shrunken copies of their images
+        self.scale = self.settings.render_scale
+        self._scaled_images = weakref.WeakKeyDictionary()
+
+        # everything is cleared from this copy of the background
+        self.background = pygame.Surface(self.screen.get_size()).convert()
+        self.background.fill(self.settings.bg_color)
+        self.screen_rect = self.screen.get_rect()
+
+        # rects drawn last frame by moving objects, keyed by object
+        self._previous = {}
+        self._drawn = {}
+        # what was drawn this frame, so a cleared area can be repainted
+        self._items = []
+        # rects of objects that only change occasionally, keyed by name
+        self._static = {}
+        self._static_seen = set()
+
+        self._cleared = []
+        self._dirty = []
+        self.full_redraw = True
+        self._full_frame = True
+
+        # pixels pushed to the display during the last frame
+        self.pixels_pushed = 0
+        # blit and blits calls made this frame, and items and time per
+        # batched layer
+        self.draw_calls = 0
+        self.layer_stats = {}
+        # regions of the finished frame still to be presented; None means
+        # the whole window
+        self._pending = []
+
+    def set_background(self, starfield, offsets=None):
+        """Copy the starfield into the cached background."""
+        if self.background.get_size() != self.screen.get_size():
+            self.background = pygame.Surface(
+                self.screen.get_size()).convert()
+            self.screen_rect = self.screen.get_rect()
+        starfield.draw(self.background, offsets)
+        self.full_redraw = True
+
+    def begin_frame(self):
+        """Restore the background under everything drawn last frame."""
+        self._cleared = []
+        self._dirty = []
+        self._drawn = {}
+        self._items = []
+        self._static_seen = set()
+        self.draw_calls = 0
+        self.layer_stats = {}
+
+        self._full_frame = (self.full_redraw
+                            or not self.settings.dirty_rendering)
+        self.draw_calls += 1
+        if self._full_frame:
+            self.screen.blit(self.background, (0, 0))
+            return
+
+        background = self.background
+        self._cleared = list(self._previous.values())
+        self.screen.blits([(background, rect, rect)
+                           for rect in self._cleared], doreturn=False)
+
+    def _to_canvas(self, rect, image=None):
+        """Return rect, and image, at the canvas resolution."""
+        scale = self.scale
+        if image is not None:
+            scaled = self._scaled_images.get(image)
+            if scaled is None:
+                scaled = pygame.transform.scale(image, (
+                    max(1, round(image.get_width() * scale)),
+                    max(1, round(image.get_height() * scale))))
+                self._scaled_images[image] = scaled
+            image = scaled
+            size = scaled.get_size()
+        else:
+            size = (max(1, round(rect.w * scale)),
+                    max(1, round(rect.h * scale)))
+        return pygame.Rect(round(rect.x * scale), round(rect.y * scale),
+                           *size), image
+
+    def draw_batch(self, layer, items):
+        """Blit many moving objects, given as (key, image, rect), at once.
+
+        Where each one was drawn is remembered so the next frame can clear
+        it; the blits go to pygame in a single Surface.blits() call.
+        """
+        start = time.perf_counter()
+        screen_rect = self.screen_rect
+        drawn = self._drawn
+        drawn_items = self._items
+        scaled = self.scale != 1
+
+        blits = []
+        for key, image, rect in items:
+            if scaled:
+                rect, image = self._to_canvas(rect, image)
+            else:
+                rect = rect.copy()
+            blits.append((image, rect))
+            # keep rects on screen; clearing with an off-screen area
+            # misaligns
+            drawn[key] = rect.clip(screen_rect)
+        drawn_items += blits
+        self.screen.blits(blits, doreturn=False)
+        self.draw_calls += 1
+
+        stats = self.layer_stats.setdefault(layer, {"items": 0, "ms": 0.0})
+        stats["items"] += len(blits)
+        stats["ms"] += (time.perf_counter() - start) * 1000
+
+    def draw_static(self, key, image, rect, dirty=False):
+        """Blit an object that only needs redrawing when it changes."""
+        if self.scale != 1:
+            rect, image = self._to_canvas(rect, image)
+        self._static_seen.add(key)
+        previous = self._static.get(key)
+        area = rect.clip(self.screen_rect)
+        touched = self._cleared + list(self._drawn.values())
+
+        if not (dirty or self._full_frame or previous != area
+                or area.collidelist(touched) != -1):
+            return
+
+        if previous is not None and previous != area:
+            self._restore(previous)
+            self._dirty.append(previous)
+        self.screen.blit(image, rect)
+        self.draw_calls += 1
+        self._static[key] = area
+        self._items.append((image, rect.copy()))
+        self._dirty.append(area)
+
+    def _restore(self, area):
+        """Clear an area and repaint anything already drawn over it."""
+        self.screen.blit(self.background, area, area)
+        self.screen.set_clip(area)
+        for image, rect in self._items:
+            if not rect.colliderect(area):
+                continue
+            self.screen.blit(image, rect)
+            self.draw_calls += 1
+        self.screen.set_clip(None)
+        self.draw_calls += 1
+
+    def end_frame(self, present=True):
+        """Finish the frame and push it, unless present() is left to do it."""
+        # static objects that were not drawn this frame have disappeared
+        for key in list(self._static):
+            if key not in self._static_seen:
+                rect = self._static.pop(key)
+                self._restore(rect)
+                self._dirty.append(rect)
+
+        if self._full_frame:
+            self._pending = None
+            self.pixels_pushed = self.screen.get_width() * \
+                self.screen.get_height()
+            self.full_redraw = False
+        else:
+            self._pending = self._coalesce()
+            self.pixels_pushed = sum(rect.w * rect.h
+                                     for rect in self._pending)
+
+        self._previous = self._drawn
+        if present:
+            self.present()
+
+    def report(self):
+        """Return this frame's draw-call and per-layer counters."""
+        return {
+            "draw_calls": self.draw_calls,
+            "pixels_pushed": self.pixels_pushed,
+            "layers": {layer: dict(stats)
+                       for layer, stats in self.layer_stats.items()},
+        }
+
+    def present(self):
+        """Push the changed regions, or the whole window, to the display."""
+        self.display.present(self._pending)
+        self._pending = []
+
+    def _coalesce(self):
+        """Merge each object's old and new rect into one update region."""
+        dirty = self._dirty
+        previous = self._previous
+        for key, rect in self._drawn.items():
+            old = previous.get(key)
+            if old is None:
+                dirty.append(rect)
+                continue
+            union = rect.union(old)
+            # only merge when it costs less than pushing both rects
+            if union.w * union.h <= rect.w * rect.h + old.w * old.h:
+                dirty.append(union)
+            else:
+                dirty.append(rect)
+                dirty.append(old)
+
+        # objects that were removed still need their old area flushed
+        for key, rect in previous.items():
+            if key not in self._drawn:
+                dirty.append(rect)
+        return dirty
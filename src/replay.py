@@ -0,0 +1,174 @@
+import json
+import struct
+import pygame  # type: ignore
+from score_store import settings_snapshot
+
+# one byte of input per simulation tick
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_FIRE = 4
+
+MAGIC = b"AIRP"
+VERSION = 3
+# magic, version, seed, sim_hz, respawn_pause, ticks, score, level,
+# ships_left
+HEADER = struct.Struct("<4sBqHfIQHB")
+# length of the JSON settings that follow the header (version 3)
+SETTINGS = struct.Struct("<I")
+# settings that only say where files go or what is measured; a replay
+# keeps its own
+NOT_REPLAYED = {"record_path", "score_db_path", "startup_report",
+                "profile_path", "watch_profile", "profile_poll",
+                "profiler_enabled", "profiler_history", "profiler_refresh"}
+# ticks in the run, then the input byte repeated for that many ticks
+RUN = struct.Struct("<HB")
+
+
+def encode_actions(left=False, right=False, fire=False):
+    """Pack one tick of input into an action byte."""
+    return ((ACTION_LEFT if left else 0) | (ACTION_RIGHT if right else 0)
+            | (ACTION_FIRE if fire else 0))
+
+
+class Recording:
+    """A seed plus the per-tick input of one game, and its outcome."""
+
+    def __init__(self, seed, sim_hz, respawn_pause=0.0, actions=None,
+                 outcome=None, settings=None):
+        self.seed = seed
+        self.sim_hz = sim_hz
+        # the pause is simulated in ticks, so replays must use the same one
+        self.respawn_pause = respawn_pause
+        self.actions = bytearray(actions or b"")
+        # (score, level, ships_left) when the recording ended
+        self.outcome = outcome
+        # the game's settings when it started, e.g. from a profile
+        self.settings = settings or {}
+
+    def apply(self, settings):
+        """Set the recorded game's settings on settings."""
+        for name, value in self.settings.items():
+            if name == "dynamic_overrides":
+                settings.dynamic_overrides = dict(value)
+            elif name not in NOT_REPLAYED:
+                setattr(settings, name, value)
+        settings.sim_hz = self.sim_hz
+        settings.respawn_pause = self.respawn_pause
+
+    def __len__(self):
+        return len(self.actions)
+
+    def save(self, path):
+        """Write the recording, run-length encoding the input stream."""
+        score, level, ships_left = self.outcome or (0, 0, 0)
+        chunks = [HEADER.pack(MAGIC, VERSION, self.seed, self.sim_hz,
+                              self.respawn_pause, len(self.actions), score,
+                              level, ships_left)]
+        settings = json.dumps(self.settings).encode()
+        chunks += [SETTINGS.pack(len(settings)), settings]
+        actions = self.actions
+        i = 0
+        while i < len(actions):
+            value = actions[i]
+            run = 1
+            while i + run < len(actions) and actions[i + run] == value \
+                    and run < 0xFFFF:
+                run += 1
+            chunks.append(RUN.pack(run, value))
+            i += run
+        with open(path, "wb") as f:
+            f.write(b"".join(chunks))
+
+    @classmethod
+    def load(cls, path):
+        """Read a recording written by save()."""
+        with open(path, "rb") as f:
+            data = f.read()
+        (magic, version, seed, sim_hz, respawn_pause, ticks, score, level,
+         ships_left) = HEADER.unpack_from(data)
+        if magic != MAGIC or version not in (2, VERSION):
+            raise ValueError(f"{path} is not an Alien Invasion recording")
+
+        # version 2 recordings were always made with the default settings
+        offset = HEADER.size
+        settings = {}
+        if version >= 3:
+            (size,) = SETTINGS.unpack_from(data, offset)
+            offset += SETTINGS.size
+            settings = json.loads(data[offset:offset + size])
+            offset += size
+
+        actions = bytearray()
+        for run, value in RUN.iter_unpack(data[offset:]):
+            actions += bytes([value]) * run
+        if len(actions) != ticks:
+            raise ValueError(f"{path} is truncated")
+        return cls(seed, sim_hz, respawn_pause, actions,
+                   (score, level, ships_left), settings)
+
+
+class Recorder:
+    """A class to capture the input the game consumes on every tick."""
+
+    def __init__(self, seed, settings):
+        snapshot = settings_snapshot(settings)
+        snapshot["dynamic_overrides"] = dict(settings.dynamic_overrides)
+        self.recording = Recording(seed, settings.sim_hz,
+                                   settings.respawn_pause, settings=snapshot)
+
+    def record(self, actions):
+        self.recording.actions.append(actions)
+
+    def finish(self, stats):
+        """Store the game's outcome and return the recording."""
+        self.recording.outcome = (stats.score, stats.level, stats.ships_left)
+        return self.recording
+
+
+class Replayer:
+    """A class to feed a recording's input back to the game tick by tick."""
+
+    def __init__(self, recording):
+        self.recording = recording
+        self.tick = 0
+
+    @property
+    def finished(self):
+        return self.tick >= len(self.recording)
+
+    def next_actions(self):
+        actions = self.recording.actions[self.tick]
+        self.tick += 1
+        return actions
+
+
+def replay(recording, headless=True, game=None, on_step=None):
+    """Play a recording back and return (score, level, ships_left).
+
+    With a display, each tick is also drawn. on_step, if given, is called
+    with the game after every tick, e.g. to close a profiler frame.
+    """
+    from alien_invasion import AlienInvasion
+    from settings import Settings
+
+    if game is None:
+        # the screen size is recorded too, so build the game from them
+        settings = Settings()
+        recording.apply(settings)
+        game = AlienInvasion(headless=headless, seed=recording.seed,
+                             settings=settings)
+    recording.apply(game.settings)
+    game._start_game()
+    game.replayer = Replayer(recording)
+    while not game.replayer.finished:
+        game._step()
+        if not headless:
+            pygame.event.pump()
+            game.audio.flush()
+            game._update_screen()
+            game.clock.tick(recording.sim_hz)
+        if on_step:
+            on_step(game)
+    game.replayer = None
+    stats = game.stats
+    return stats.score, stats.level, stats.ships_left
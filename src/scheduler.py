@@ -0,0 +1,34 @@
+import heapq
+import itertools
+
+
+class Scheduler:
+    """A class to run callbacks after delays measured in game time.
+
+    Game time only moves when the simulation steps, so timed states pause
+    with the game, replay identically and cost nothing when headless.
+    """
+
+    def __init__(self):
+        """Initialize the game clock and an empty timer queue."""
+        self.time = 0.0
+        self._timers = []
+        # breaks ties so timers due together fire in the order they were set
+        self._counter = itertools.count()
+
+    def after(self, delay, callback):
+        """Call callback once delay seconds of game time have passed."""
+        heapq.heappush(self._timers,
+                       (self.time + delay, next(self._counter), callback))
+
+    def clear(self):
+        """Drop every pending timer."""
+        self._timers = []
+
+    def advance(self, seconds):
+        """Move game time forward and fire the timers that came due."""
+        self.time += seconds
+        timers = self._timers
+        while timers and timers[0][0] <= self.time:
+            _, _, callback = heapq.heappop(timers)
+            callback()
@@ -0,0 +1,122 @@
+import atexit
+import json
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished REAL NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    seed INTEGER,
+    settings TEXT
+);
+CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC);
+"""
+
+# tells the writer thread to finish
+_STOP = object()
+
+
+def settings_snapshot(settings):
+    """Return the plain values of a Settings object as a dictionary."""
+    return {name: value for name, value in vars(settings).items()
+            if isinstance(value, (bool, int, float, str))}
+
+
+class ScoreStore:
+    """A class to keep game results in SQLite, written off the main thread.
+
+    Results are queued and a writer thread stores everything waiting in
+    one transaction, so the game loop never waits on the disk.
+    """
+
+    def __init__(self, path, batch_delay=0.5):
+        """Open the database and start the writer thread."""
+        self.path = str(path)
+        self.batch_delay = batch_delay
+
+        # reads happen on the main thread through their own connection
+        self._reader = sqlite3.connect(self.path)
+        self._reader.executescript(SCHEMA)
+        self._reader.commit()
+
+        self._queue = queue.Queue()
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self._writer = threading.Thread(target=self._write_loop,
+                                        daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def high_score(self):
+        """Return the best score stored, or 0."""
+        row = self._reader.execute("SELECT MAX(score) FROM games").fetchone()
+        return row[0] or 0
+
+    def top(self, count=10):
+        """Return the best stored games as (score, level, finished) rows."""
+        return self._reader.execute(
+            "SELECT score, level, finished FROM games"
+            " ORDER BY score DESC LIMIT ?", (count,)).fetchall()
+
+    def add(self, score, level, duration, seed=None, settings=None):
+        """Queue a finished game to be written."""
+        self._queue.put((time.time(), score, level, duration, seed,
+                         json.dumps(settings) if settings else None))
+
+    def flush(self):
+        """Wait until every queued game has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write what is queued, then stop the writer thread."""
+        if not self._writer.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._reader.close()
+        atexit.unregister(self.close)
+
+    def _write_loop(self):
+        connection = sqlite3.connect(self.path)
+        running = True
+        while running:
+            rows = [self._queue.get()]
+            # give games finishing close together a chance to share a write
+            time.sleep(self.batch_delay if rows[0] is not _STOP else 0)
+            while True:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if _STOP in rows:
+                running = False
+                rows = [row for row in rows if row is not _STOP]
+            if rows:
+                # one transaction per batch: it is stored whole or not at all
+                try:
+                    with connection:
+                        connection.executemany(
+                            "INSERT INTO games (finished, score, level,"
+                            " duration, seed, settings)"
+                            " VALUES (?, ?, ?, ?, ?, ?)", rows)
+                except sqlite3.Error as error:
+                    # e.g. a full disk or a locked file; keep the thread
+                    # alive so flush() and close() still return
+                    self.failed += len(rows)
+                    print(f"could not save {len(rows)} games: {error}",
+                          file=sys.stderr)
+                else:
+                    self.written += len(rows)
+                    self.batches += 1
+            for _ in range(len(rows) + (not running)):
+                self._queue.task_done()
+        connection.close()
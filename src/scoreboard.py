@@ -1,4 +1,8 @@
-import pygame.font
+import pygame  # type: ignore
+from text_cache import get_font, get_glyph_cache
+
+# best stored games listed under the play button
+TOP_COUNT = 5
 
 
 class ScoreBoard:
@@ -6,60 +10,119 @@ class ScoreBoard:
 
     def __init__(self, ai_game):
         """Initialize score keeping attributes."""
-        self.screen = ai_game.screen
-        self.screen_rect = self.screen.get_rect()
+        self.screen_rect = ai_game.screen_rect
         self.settings = ai_game.settings
         self.stats = ai_game.stats
 
         # font setting for scoring info
         self.text_color = (57, 255, 20)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = get_font(48)
+        self.glyphs = get_glyph_cache(self.font, self.text_color,
+                                      self.settings.bg_color)
+        self.small_glyphs = get_glyph_cache(get_font(32), self.text_color,
+                                            self.settings.bg_color)
+
+        # images that changed since the renderer last drew them
+        self.dirty = True
+        # the strings currently shown, so unchanged values aren't redrawn
+        self._score_str = None
+        self._high_score_str = None
+        self._level_str = None
 
         # prepare the initial score image
         self.prep_score()
         self.prep_high_score()
         self.prep_level()
 
+        # best scores kept between runs, if the game keeps any
+        scores = ai_game.scores
+        self.prep_top_scores([row[0] for row in scores.top(TOP_COUNT)]
+                             if scores is not None else [])
+
     def prep_score(self):
         """Turn the score into a rendered image."""
         rounded_score = round(self.stats.score, -1)
         score_str = f"{rounded_score:,}"
-        self.score_image = self.font.render(
-            score_str, True, self.text_color, self.settings.bg_color
-        )
+        if score_str == self._score_str:
+            return
+        self._score_str = score_str
+        self.score_image = self.glyphs.render(score_str)
 
         # display the score a the top right of screen
         self.score_rect = self.score_image.get_rect()
         self.score_rect.right = self.screen_rect.right - 20
         self.score_rect.top = 20
+        self.dirty = True
 
     def prep_high_score(self):
         """Turn the high score into a rendered image."""
         high_score = round(self.stats.high_score, -1)
         high_score_str = f"{high_score:,}"
-        self.high_score_image = self.font.render(high_score_str, True,
-                                                 self.text_color,
-                                                 self.settings.bg_color)
+        if high_score_str == self._high_score_str:
+            return
+        self._high_score_str = high_score_str
+        self.high_score_image = self.glyphs.render(high_score_str)
         self.high_score_rect = self.high_score_image.get_rect()
         self.high_score_rect.centerx = self.screen_rect.centerx
         self.high_score_rect.top = self.score_rect.top
+        self.dirty = True
 
     def prep_level(self):
         """Turn the level into a rendered image"""
         level_str = str(self.stats.level)
-        self.level_image = self.font.render(level_str, True,
-                                            self.text_color,
-                                            self.settings.bg_color)
+        if level_str == self._level_str:
+            return
+        self._level_str = level_str
+        self.level_image = self.glyphs.render(level_str)
         # position the level below the score.
         self.level_rect = self.level_image.get_rect()
         self.level_rect.right = self.score_rect.right
         self.level_rect.top = self.score_rect.bottom + 10
+        self.dirty = True
+
+    def prep_top_scores(self, scores):
+        """Turn the best scores into one ranked list image."""
+        self.top_scores = sorted(scores, reverse=True)[:TOP_COUNT]
+        self._top_scores_dirty = True
+        lines = [self.small_glyphs.render(f"{rank}. {score:,}")
+                 for rank, score in enumerate(self.top_scores, 1)]
+        if not lines:
+            self.top_scores_image = None
+            return
+
+        line_height = self.small_glyphs.height
+        image = pygame.Surface((max(line.get_width() for line in lines),
+                                line_height * len(lines)))
+        image.fill(self.settings.bg_color)
+        for i, line in enumerate(lines):
+            image.blit(line, (0, i * line_height))
+        self.top_scores_image = image
+        # list the scores below the play button
+        self.top_scores_rect = image.get_rect()
+        self.top_scores_rect.centerx = self.screen_rect.centerx
+        self.top_scores_rect.top = self.screen_rect.centery + 60
+
+    def add_top_score(self, score):
+        """Put a just finished game's score in the list if it ranks."""
+        self.prep_top_scores(self.top_scores + [score])
+
+    def draw(self, renderer):
+        """Hand the score images to the renderer, redrawn only if changed."""
+        renderer.draw_static("score", self.score_image, self.score_rect,
+                             self.dirty)
+        renderer.draw_static("high_score", self.high_score_image,
+                             self.high_score_rect, self.dirty)
+        renderer.draw_static("level", self.level_image, self.level_rect,
+                             self.dirty)
+        self.dirty = False
 
-    def show_score(self):
-        """Draw screen to story"""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
+    def draw_top_scores(self, renderer):
+        """Hand the list of best scores to the renderer."""
+        if self.top_scores_image is None:
+            return
+        renderer.draw_static("top_scores", self.top_scores_image,
+                             self.top_scores_rect, self._top_scores_dirty)
+        self._top_scores_dirty = False
 
     def check_high_score(self):
         """Check to see if there's a new high score."""
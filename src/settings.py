@@ -1,3 +1,4 @@
+from pathlib import Path
 # from game_stats import GameStats
 
 
@@ -14,28 +15,119 @@ class Settings:
         self.screen_width = 1200
         self.screen_height = 800
         self.bg_color = (5, 5, 15)  # sky blue color
+        # show the screen above in a window of this size, or fullscreen,
+        # scaled to fit; None shows it at its own size
+        self.window_size = None
+        self.fullscreen = False
+        # "nearest" keeps pixels sharp when scaling, "smooth" filters them
+        self.scale_filter = "nearest"
+        # scale on the GPU with pygame.SCALED instead of a software blit;
+        # SDL sizes that window itself, so window_size scales in software
+        self.gpu_scaling = True
+        # draw at this fraction of the screen size and scale it up; below 1
+        # makes drawing cheaper on weak hardware
+        self.render_scale = 1.0
+        # push only changed regions; False flips the whole window each frame
+        self.dirty_rendering = True
+
+        # compose frames on a worker thread while the next steps simulate;
+        # frames are shown one frame later than in the serial loop
+        self.threaded_render = False
+
+        # game loop settings
+        # speeds below are in pixels per tick at base_hz
+        self.base_hz = 60
+        # simulation steps per second when running a fixed timestep
+        self.sim_hz = 120
+        # cap on rendered frames per second; 0 renders as fast as possible
+        self.max_fps = 60
+        # False runs one simulation step per rendered frame, ticking at sim_hz
+        self.fixed_timestep = True
+        # draw moving objects between their last two simulated positions
+        self.interpolate = True
+        # steps allowed per frame before the simulation drops time
+        self.max_steps_per_frame = 5
+
+        # mixer format; a smaller buffer lowers latency but can crackle
+        self.audio_frequency = 44100
+        self.audio_size = -16
+        self.audio_channels = 2
+        self.audio_buffer = 512
+        # channels reserved for each sound, capping how many can overlap
+        self.sound_voices = {"laser.wav": 4, "explosion.wav": 2}
+
+        # keys per action, overriding the defaults in input_handler.py,
+        # e.g. {"left": ("a", "left"), "fire": ("space", "w")}
+        self.key_bindings = {}
+
+        # print the time each startup stage took once the first frame is up
+        self.startup_report = False
+
+        # SQLite file finished games and the high score are kept in, next
+        # to the game like its assets; None keeps nothing between runs
+        self.score_db_path = str(Path(__file__).resolve().parent
+                                 / "scores.db")
+
+        # file the next game's input is recorded to; None disables it
+        self.record_path = None
+
+        # profiler settings; F3 shows the overlay, F4 exports the frames
+        self.profiler_enabled = False
+        self.profiler_history = 600
+        # seconds between overlay refreshes
+        self.profiler_refresh = 0.25
 
         # ship settings
         self.ship_limit = 3
+        # seconds the game pauses after the ship is hit
+        self.respawn_pause = 0.5
 
         # bullet settings
         self.bullet_width = 3
         self.bullet_height = 15
         self.bullet_color = (57, 255, 20)  # lime green color
         self.bullets_allowed = 100
+        # find bullet hits through a grid of the fleet instead of testing
+        # every bullet against every alien
+        self.collision_grid = True
 
         # star settings
         self.star_color = (245, 245, 250)  # soft white
         self.star_radius = 1
+        self.star_count = 1000
+        # seed for the star positions; None picks a new sky every run
+        self.star_seed = None
+        # parallax layers scroll down at star_scroll_speed for the nearest
+        # layer; a speed of 0 keeps the background static
+        self.star_layers = 1
+        self.star_scroll_speed = 0
 
         # alien settings
         self.fleet_drop_speed = 5
+        # cross-check the tracked fleet extent against a full scan (slow)
+        self.fleet_bounds_check = False
+        # store the fleet in NumPy arrays (if installed) for large fleets
+        self.array_fleet = False
 
         # how quickly the game speeds up
         self.speedup_scale = 1.1
 
+        # profile file loaded over these defaults, and whether edits to it
+        # are applied while the game runs (checked every profile_poll s)
+        self.profile_path = None
+        self.watch_profile = True
+        self.profile_poll = 0.5
+
+        # dynamic settings set by a profile; they survive every reset
+        self.dynamic_overrides = {}
+
         self.initialize_dynamic_settings()
 
+    @property
+    def step_scale(self):
+        """Return how far one simulation step moves compared to base_hz."""
+        return self.base_hz / self.sim_hz
+
     def initialize_dynamic_settings(self):
         """Initialize the settings that can change throughout out the game."""
         self.ship_speed = 1.5
@@ -46,6 +138,9 @@ class Settings:
         # fleet direction of 1 represents right; -1 represents left
         self.fleet_direction = 1
 
+        for name, value in self.dynamic_overrides.items():
+            setattr(self, name, value)
+
     def increase_speed(self):
         """Increase speed settings."""
         self.ship_speed *= self.speedup_scale
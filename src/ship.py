@@ -1,21 +1,14 @@
-import pygame  # type ignore
-from pathlib import Path
-
-current_dir = Path(__file__).resolve().parent
-ship_path = f"{current_dir}/images/ship.bmp"
-
 
 class Ship:
     """A class to help manage the ship."""
 
     def __init__(self, ai_game):
         """Initialize the ship and set it's starting position."""
-        self.screen = ai_game.screen
-        self.screen_rect = ai_game.screen.get_rect()
+        self.screen_rect = ai_game.screen_rect
         self.settings = ai_game.settings
 
-        # load the ship image and get its rect
-        self.image = pygame.image.load(ship_path)
+        # use the shared ship image and get its rect
+        self.image = ai_game.assets.image("ship.bmp")
         self.rect = self.image.get_rect()
 
         # start each new ship at the bottom of the screen
@@ -25,6 +18,8 @@ class Ship:
         # store a float for the ships exact horizontal/vertical position
         self.x = float(self.rect.x)
         # self.y = float(self.rect.y)
+        # position before the last simulation step, for interpolation
+        self.prev_x = self.x
 
         # movement flag; start with a ship that isn't moving
         self.moving_right = False
@@ -36,6 +31,7 @@ class Ship:
         """Center the ship on the screen."""
         self.rect.midbottom = self.screen_rect.midbottom
         self.x = float(self.rect.x)
+        self.prev_x = self.x
 
     def update(self):
         """Update the ship's position based on the movement flag."""
@@ -43,16 +39,13 @@ class Ship:
         # update ship's x value to not go off screen
         # setting the ship speed based on the settings file
         # update ship position based on speed settings
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_RIGHT] and self.rect.right < \
-                self.screen.get_rect().right:
-            self.x += self.settings.ship_speed
-        if keys[pygame.K_LEFT] and self.rect.left > 0:
-            self.x -= self.settings.ship_speed
-        # if self.moving_right and self.rect.right < self.screen_rect.right:
-        #     self.x += self.settings.ship_speed
-        # if self.moving_left and self.rect.left > 0:
-        #     self.x -= self.settings.ship_speed
+        self.prev_x = self.x
+        step = self.settings.ship_speed * self.settings.step_scale
+        # the flags are set each step from the input's action byte
+        if self.moving_right and self.rect.right < self.screen_rect.right:
+            self.x += step
+        if self.moving_left and self.rect.left > 0:
+            self.x -= step
         # if self.moving_up and self.rect.top > self.screen_rect.top:
         #     self.y -= self.settings.ship_speed
         # if self.moving_down and self.rect.bottom < self.screen_rect.bottom:
@@ -61,7 +54,3 @@ class Ship:
         # update rect object from self.x
         self.rect.x = self.x
         # self.rect.y = self.y
-
-    def blitme(self):
-        """Draw the ship at its current location."""
-        self.screen.blit(self.image, self.rect)
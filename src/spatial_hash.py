@@ -0,0 +1,101 @@
+class SpatialHash:
+    """A class to index the fleet in a uniform grid for collision queries.
+
+    Aliens are stored by their position relative to the fleet's origin.
+    The fleet moves rigidly, so moving it only shifts the origin and the
+    cells never have to be rebuilt until the next fleet is created.
+    """
+
+    def __init__(self, cell_size):
+        """Initialize an empty grid with square cells of cell_size."""
+        self.cell_size = cell_size
+        self.cells = {}
+        self._keys = {}
+        self.origin_x = 0.0
+        self.origin_y = 0.0
+        # local-space box around everything indexed, for quick rejects
+        self.bounds = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _cell_range(self, left, top, right, bottom):
+        """Return the keys of every cell covering a local-space box."""
+        size = self.cell_size
+        return [(cx, cy)
+                for cx in range(int(left // size), int(right // size) + 1)
+                for cy in range(int(top // size), int(bottom // size) + 1)]
+
+    def rebuild(self, sprites):
+        """Index every sprite at its current position."""
+        self.cells = {}
+        self._keys = {}
+        self.origin_x = 0.0
+        self.origin_y = 0.0
+        self.bounds = None
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def insert(self, sprite):
+        """Add a sprite to every cell its rect covers."""
+        rect = sprite.rect
+        left = rect.left - self.origin_x
+        top = rect.top - self.origin_y
+        right = left + rect.width - 1
+        bottom = top + rect.height - 1
+        keys = self._cell_range(left, top, right, bottom)
+        if self.bounds is None:
+            self.bounds = [left, top, right, bottom]
+        else:
+            bounds = self.bounds
+            bounds[0] = min(bounds[0], left)
+            bounds[1] = min(bounds[1], top)
+            bounds[2] = max(bounds[2], right)
+            bounds[3] = max(bounds[3], bottom)
+        for key in keys:
+            self.cells.setdefault(key, []).append(sprite)
+        self._keys[sprite] = keys
+
+    def remove(self, sprite):
+        """Drop a sprite from the grid."""
+        for key in self._keys.pop(sprite, ()):
+            cell = self.cells[key]
+            cell.remove(sprite)
+            if not cell:
+                del self.cells[key]
+
+    def move(self, dx, dy):
+        """Shift every indexed sprite by the same offset."""
+        self.origin_x += dx
+        self.origin_y += dy
+
+    def query(self, rect):
+        """Return the sprites in the cells a rect overlaps.
+
+        The box is padded by a pixel on each side because sprite rects are
+        truncated from float positions; callers still test the real rects.
+        """
+        left = rect.left - self.origin_x - 1
+        top = rect.top - self.origin_y - 1
+        right = left + rect.width + 1
+        bottom = top + rect.height + 1
+        bounds = self.bounds
+        # most bullets are nowhere near the fleet
+        if bounds is None or right < bounds[0] or left > bounds[2] \
+                or bottom < bounds[1] or top > bounds[3]:
+            return ()
+
+        size = self.cell_size
+        first_x, last_x = int(left // size), int(right // size)
+        first_y, last_y = int(top // size), int(bottom // size)
+        cells = self.cells
+        if first_x == last_x and first_y == last_y:
+            return cells.get((first_x, first_y), ())
+
+        found = {}
+        for cx in range(first_x, last_x + 1):
+            for cy in range(first_y, last_y + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found.update(dict.fromkeys(cell))
+        return found
@@ -0,0 +1,78 @@
+import random
+import pygame  # type: ignore
+
+
+class Starfield:
+    """A class to pre-render the star background into layer surfaces."""
+
+    def __init__(self, ai_game, seed=None):
+        """Initialize the starfield and render its layers."""
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.seed = self.settings.star_seed if seed is None else seed
+
+        self.layers = []
+        self.offsets = []
+        self.size = None
+        self.render()
+
+    @property
+    def static(self):
+        """Return True if the background never changes between frames."""
+        return self.settings.star_scroll_speed == 0
+
+    def render(self, seed=None):
+        """Draw every star once into one surface per parallax layer."""
+        if seed is not None:
+            self.seed = seed
+        rng = random.Random(self.seed)
+        self.size = self.screen.get_size()
+        width, height = self.size
+        radius = self.settings.star_radius
+        layer_count = max(1, self.settings.star_layers)
+
+        self.layers = []
+        self.offsets = [0.0] * layer_count
+        for index in range(layer_count):
+            if index == 0:
+                # the farthest layer also carries the background color so
+                # the whole background is a single opaque blit
+                layer = pygame.Surface(self.size).convert()
+                layer.fill(self.settings.bg_color)
+            else:
+                # nearer layers are keyed on black so only stars are copied
+                layer = pygame.Surface(self.size).convert()
+                layer.fill((0, 0, 0))
+                layer.set_colorkey((0, 0, 0))
+            self.layers.append(layer)
+
+        # far layers get dimmer stars to sell the depth
+        for _ in range(self.settings.star_count):
+            index = rng.randrange(layer_count)
+            x = rng.randint(0, width)
+            y = rng.randint(0, height)
+            shade = (index + 1) / layer_count
+            color = tuple(int(c * shade) for c in self.settings.star_color)
+            pygame.draw.circle(self.layers[index], color, (x, y), radius)
+
+    def update(self):
+        """Scroll each parallax layer by its own speed."""
+        if self.static:
+            return
+        height = self.size[1]
+        layer_count = len(self.layers)
+        for index in range(layer_count):
+            speed = (self.settings.star_scroll_speed * self.settings.step_scale
+                     * (index + 1) / layer_count)
+            self.offsets[index] = (self.offsets[index] + speed) % height
+
+    def draw(self, surface=None, offsets=None):
+        """Blit the background layers, wrapping scrolled layers around."""
+        surface = self.screen if surface is None else surface
+        offsets = self.offsets if offsets is None else offsets
+        height = self.size[1]
+        for layer, offset in zip(self.layers, offsets):
+            offset = int(offset)
+            surface.blit(layer, (0, offset))
+            if offset:
+                surface.blit(layer, (0, offset - height))
@@ -0,0 +1,34 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """A class to time each stage of startup, in the order they ran."""
+
+    def __init__(self):
+        """Start the clock for the whole startup."""
+        self.start = time.perf_counter()
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Time the code run inside a with block under name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + \
+                time.perf_counter() - start
+
+    def mark(self, name):
+        """Record the time from the start of startup until now."""
+        self.stages[name] = time.perf_counter() - self.start
+
+    def report(self):
+        """Return each stage's time in milliseconds."""
+        return {name: seconds * 1000 for name, seconds in self.stages.items()}
+
+    def format(self):
+        """Return the report as one line of text."""
+        return "  ".join(f"{name} {ms:.1f}ms"
+                         for name, ms in self.report().items())
@@ -0,0 +1,69 @@
+import pygame.font
+
+# resolved fonts and glyph caches shared by every text on screen
+_fonts = {}
+_glyph_caches = {}
+
+
+def get_font(size=48):
+    """Return the shared default font at the given size.
+
+    SysFont(None, size) resolves to this same default font, but only after
+    scanning the system font list, so the scan is skipped entirely.
+    """
+    font = _fonts.get(size)
+    if font is None:
+        font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
+
+
+def get_glyph_cache(font, color, bg_color):
+    """Return the shared glyph cache for a font and color pair."""
+    key = (font, tuple(color), tuple(bg_color))
+    cache = _glyph_caches.get(key)
+    if cache is None:
+        cache = GlyphCache(font, color, bg_color)
+        _glyph_caches[key] = cache
+    return cache
+
+
+class GlyphCache:
+    """A class to compose text from glyph surfaces rendered only once."""
+
+    def __init__(self, font, color, bg_color):
+        """Initialize an empty cache for one font and color pair."""
+        self.font = font
+        self.color = color
+        self.bg_color = bg_color
+        self.height = font.get_linesize()
+        self.glyphs = {}
+
+        # counters for how often glyphs and strings are built
+        self.glyph_renders = 0
+        self.compositions = 0
+
+    def glyph(self, char):
+        """Return the cached surface for a single character."""
+        surface = self.glyphs.get(char)
+        if surface is None:
+            surface = self.font.render(char, True, self.color, self.bg_color)
+            self.glyphs[char] = surface
+            self.glyph_renders += 1
+        return surface
+
+    def render(self, text):
+        """Blit cached glyphs side by side into a new text surface."""
+        glyphs = [self.glyph(char) for char in text]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        height = max((glyph.get_height() for glyph in glyphs),
+                     default=self.height)
+
+        image = pygame.Surface((max(width, 1), height))
+        image.fill(self.bg_color)
+        x = 0
+        for glyph in glyphs:
+            image.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        self.compositions += 1
+        return image
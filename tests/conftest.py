@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+from pathlib import Path
+import pytest
+
+# the game's modules live flat in src/, as the game imports them
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# no window and no sound device
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-scale", type=float, action="append",
+                     help="screen scales to benchmark (default: 1)")
+    parser.addoption("--bench-threshold", action="append", default=[],
+                     metavar="NAME=MS",
+                     help="per-subsystem limits (default: frame budget)")
+
+
+def pytest_generate_tests(metafunc):
+    if "scale" in metafunc.fixturenames:
+        metafunc.parametrize("scale",
+                             metafunc.config.getoption("bench_scale") or [1])
+
+
+@pytest.fixture
+def thresholds(request):
+    from bench_stress import parse_thresholds
+
+    return parse_thresholds(request.config.getoption("bench_threshold"))
+
+
+@pytest.fixture
+def make_game():
+    """Return a factory for headless games with adjusted settings."""
+    from alien_invasion import AlienInvasion
+    from settings import Settings
+
+    def make(seed=1, **values):
+        settings = Settings()
+        for name, value in values.items():
+            setattr(settings, name, value)
+        return AlienInvasion(headless=True, seed=seed, settings=settings)
+
+    return make
+
+
+@pytest.fixture
+def play_trace(make_game):
+    """Return a function playing seeded random input on adjusted settings.
+
+    It samples (score, level, ships_left, aliens) every 250 ticks, so two
+    implementations of the same rules can be compared.
+    """
+    from replay import encode_actions
+
+    def play(ticks=4000, **values):
+        game = make_game(seed=5, **values)
+        game._start_game()
+        rng = random.Random(5)
+        trace = []
+        for tick in range(ticks):
+            direction = rng.randrange(3)
+            game._step(encode_actions(direction == 1, direction == 2,
+                                      rng.random() < 0.3))
+            if tick % 250 == 0:
+                stats = game.stats
+                trace.append((stats.score, stats.level, stats.ships_left,
+                              len(game.aliens)))
+        return trace
+
+    return play
@@ -0,0 +1,26 @@
+import random
+import pytest
+from bench_stress import FRAME_BUDGET_MS, SUBSYSTEMS, build_scenario, refill
+
+# run with --benchmark-json PATH for a machine-readable report
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.parametrize("name", SUBSYSTEMS)
+def test_subsystem_within_budget(benchmark, thresholds, scale, name):
+    game = build_scenario(scale, bullets=100, stars=1000, seed=1)
+    rng = random.Random(1)
+
+    def setup():
+        refill(game, rng)
+        if name == "_update_screen":
+            # the first frame after a fleet rebuild is a full redraw
+            game.renderer.full_redraw = False
+
+    benchmark.extra_info.update(
+        scale=scale, aliens=len(game.aliens),
+        screen=[game.settings.screen_width, game.settings.screen_height])
+    benchmark.pedantic(getattr(game, name), setup=setup, rounds=20)
+
+    limit = thresholds.get(name, FRAME_BUDGET_MS)
+    assert benchmark.stats.stats.median * 1000 <= limit
@@ -0,0 +1,25 @@
+import pytest
+from bench_collisions import (build_grid, build_scene, collide_grid,
+                              collide_groupcollide)
+
+
+def hits(collisions):
+    """Return the bullet and alien positions that collided, comparably."""
+    return {bullet.rect.topleft: sorted(alien.rect.topleft
+                                        for alien in aliens)
+            for bullet, aliens in collisions.items()}
+
+
+@pytest.mark.parametrize("alien_count, bullet_count",
+                         [(40, 100), (400, 1000)])
+@pytest.mark.parametrize("seed", range(3))
+def test_grid_matches_groupcollide(alien_count, bullet_count, seed):
+    aliens, bullets, cell = build_scene(alien_count, bullet_count, seed)
+    expected = hits(collide_groupcollide(aliens, bullets))
+    assert expected
+    assert hits(collide_grid(build_grid(aliens, cell), bullets)) == expected
+
+
+def test_game_collision_grid_matches_groupcollide(play_trace):
+    assert play_trace(collision_grid=True) == \
+        play_trace(collision_grid=False)
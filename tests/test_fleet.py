@@ -0,0 +1,7 @@
+import pytest
+
+
+def test_array_fleet_matches_sprite_fleet(make_game, play_trace):
+    pytest.importorskip("numpy")
+    assert make_game(array_fleet=True).array_fleet
+    assert play_trace(array_fleet=True) == play_trace(array_fleet=False)
@@ -0,0 +1,84 @@
+import pygame  # type: ignore
+import pytest
+from input_handler import InputHandler, key_event
+
+
+@pytest.fixture(autouse=True)
+def display():
+    # key names are looked up through the video subsystem
+    pygame.display.init()
+
+
+def make_handler(bindings=None):
+    """Return a handler that only sees injected events."""
+    return InputHandler(bindings, source=lambda: [])
+
+
+def test_inject_drives_held_and_triggered():
+    handler = make_handler()
+    handler.inject(key_event("right"), key_event("space"))
+    assert handler.poll() == ["right", "fire"]
+    assert handler.held("right") and handler.held("fire")
+
+    # held keys stay held, but trigger only once
+    assert handler.poll() == []
+    assert handler.held("right")
+
+    handler.inject(key_event("right", down=False))
+    handler.poll()
+    assert not handler.held("right")
+    assert handler.held("fire")
+
+
+def test_repeated_keydown_is_ignored():
+    handler = make_handler()
+    handler.inject(key_event("left"), key_event("left"))
+    assert handler.poll() == ["left"]
+    handler.inject(key_event("left", down=False))
+    handler.poll()
+    assert not handler.held("left")
+
+
+def test_two_keys_for_one_action():
+    handler = make_handler({"fire": ("space", "w")})
+    handler.inject(key_event("space"), key_event("w"),
+                   key_event("space", down=False))
+    assert handler.poll() == ["fire", "fire"]
+    # still held through the other key
+    assert handler.held("fire")
+
+
+def test_bind_replaces_keys():
+    handler = make_handler()
+    handler.bind("fire", "w")
+    handler.inject(key_event("space"), key_event("w"))
+    assert handler.poll() == ["fire"]
+    assert handler.bindings()["fire"] == (pygame.K_w,)
+
+
+def test_focus_loss_releases_keys():
+    handler = make_handler()
+    handler.inject(key_event("left"),
+                   pygame.event.Event(pygame.WINDOWFOCUSLOST))
+    handler.poll()
+    assert not handler.held("left")
+
+
+def test_game_moves_ship_from_injected_keys(make_game):
+    game = make_game()
+    game.input.source = lambda: []
+    game.input.inject(key_event("p"))
+    game._check_events()
+    assert game.game_active
+
+    x = game.ship.x
+    game.input.inject(key_event("right"))
+    game._check_events()
+    for _ in range(10):
+        game._step()
+    assert game.ship.x > x
+
+    game.input.inject(key_event("space"))
+    game._check_events()
+    game._step()
+    assert len(game.bullets) == 1
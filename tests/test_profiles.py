@@ -0,0 +1,101 @@
+import json
+import pytest
+from profiles import ProfileError, ProfileWatcher, load_settings, validate
+
+
+@pytest.mark.parametrize("values", [
+    {"key_bindings": {"fire": ["spcae"]}},
+    {"key_bindings": {"jump": ["x"]}},
+    {"bg_color": [300, 0, 0]},
+    {"bullet_color": [1, 2]},
+    {"window_size": [0, 400]},
+    {"sound_voices": {"laser.wav": 0}},
+    {"max_fps": -1},
+    {"respawn_pause": -0.5},
+    {"star_scroll_speed": -1},
+    {"scale_filter": "blurry"},
+    {"ship_speed": "fast"},
+    {"no_such_setting": 1},
+    {"preset": "no-such-preset"},
+])
+def test_invalid_values_are_rejected(values):
+    with pytest.raises(ProfileError):
+        validate(values)
+
+
+def test_all_problems_are_reported_together():
+    with pytest.raises(ProfileError) as error:
+        validate({"max_fps": -1, "bg_color": [300, 0, 0]})
+    assert "max_fps" in str(error.value)
+    assert "bg_color" in str(error.value)
+
+
+def test_values_are_converted():
+    values = validate({"bg_color": [1, 2, 3], "window_size": [600, 400],
+                       "key_bindings": {"fire": ["w", 32]},
+                       "bullet_speed": 2})
+    assert values == {"bg_color": (1, 2, 3), "window_size": (600, 400),
+                      "key_bindings": {"fire": ("w", 32)},
+                      "bullet_speed": 2.0}
+
+
+def test_profile_applies_over_preset(tmp_path):
+    path = tmp_path / "profile.toml"
+    path.write_text('preset = "low-end"\nstar_count = 50\n')
+    settings = load_settings(path)
+    assert settings.star_count == 50
+    assert settings.render_scale == 0.5
+    assert settings.profile_path == str(path)
+
+
+def write(path, values):
+    path.write_text(json.dumps({"score_db_path": None, **values}))
+
+
+def test_reload_rebuilds_dependants(make_game, tmp_path):
+    path = tmp_path / "profile.json"
+    write(path, {})
+    game = make_game(profile_path=str(path), score_db_path=None)
+    game._start_game()
+    watcher = ProfileWatcher(game)
+
+    write(path, {"bullet_width": 9, "ship_speed": 3.0, "render_scale": 0.5})
+    report = watcher.reload()
+    assert report["invalidated"] == ["bullets"]
+    assert report["needs_restart"] == ["render_scale"]
+    assert game.bullets.image.get_width() == 9
+    # the canvas was built for the old scale, so it stays until restart
+    assert game.settings.render_scale == 1.0
+    # dynamic settings keep profile values across resets
+    game.settings.initialize_dynamic_settings()
+    assert game.settings.ship_speed == 3.0
+
+
+def test_invalid_reload_keeps_settings(make_game, tmp_path):
+    path = tmp_path / "profile.json"
+    write(path, {"bullet_width": 5})
+    game = make_game(profile_path=str(path), bullet_width=5)
+    watcher = ProfileWatcher(game)
+
+    write(path, {"bullet_width": 9, "bg_color": [300, 0, 0]})
+    assert "error" in watcher.reload()
+    assert game.settings.bullet_width == 5
+    assert game.settings.bg_color == (5, 5, 15)
+
+
+def test_screen_size_waits_for_restart(make_game, tmp_path):
+    path = tmp_path / "profile.json"
+    write(path, {})
+    game = make_game(profile_path=str(path), score_db_path=None)
+    watcher = ProfileWatcher(game)
+
+    write(path, {"screen_width": 600, "screen_height": 1600})
+    report = watcher.reload()
+    assert report["needs_restart"] == ["screen_height", "screen_width"]
+    assert watcher.pending == {"screen_width": 600, "screen_height": 1600}
+    assert game.settings.screen_width == 1200
+
+    game._start_game()
+    assert game.fleet_bounds.bottom <= game.screen_rect.bottom
+    assert game.display.to_logical(game.play_button.rect.center) == \
+        game.play_button.rect.center
@@ -0,0 +1,26 @@
+import random
+import pygame  # type: ignore
+
+
+def frame_bytes(game, dirty):
+    """Draw a frame with or without dirty rendering and return its pixels."""
+    game.settings.dirty_rendering = dirty
+    game._update_screen()
+    return pygame.image.tobytes(game.screen, "RGB")
+
+
+def test_dirty_rendering_matches_full_redraw(make_game):
+    game = make_game(seed=3, star_seed=1)
+    game._create_star()
+    game._update_screen()
+    game._start_game()
+    rng = random.Random(3)
+
+    for frame in range(200):
+        game.ship.x += rng.choice([-3, 0, 3])
+        game.ship.rect.x = game.ship.x
+        if frame % 3 == 0:
+            game._fire_bullet()
+        game._update_bullets()
+        game._update_aliens()
+        assert frame_bytes(game, True) == frame_bytes(game, False), frame
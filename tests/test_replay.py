@@ -0,0 +1,51 @@
+import random
+from headless import random_agent
+from replay import Recording, encode_actions, replay
+
+
+def play_recorded(game, path, ticks=3000):
+    """Play a random agent's game while recording it; return the outcome."""
+    game.settings.record_path = str(path)
+    game._start_game()
+    rng = random.Random(2)
+    for _ in range(ticks):
+        if not game.game_active:
+            break
+        game._step(encode_actions(*random_agent(game, rng)))
+    game._finish_recording()
+    stats = game.stats
+    return stats.score, stats.level, stats.ships_left
+
+
+def test_replay_reproduces_outcome(make_game, tmp_path):
+    path = tmp_path / "game.airp"
+    outcome = play_recorded(make_game(seed=7), path)
+
+    recording = Recording.load(path)
+    assert recording.outcome == outcome
+    assert replay(recording) == outcome
+
+
+def test_replay_uses_recorded_settings(make_game, tmp_path):
+    path = tmp_path / "game.airp"
+    game = make_game(seed=7, bullets_allowed=3, screen_width=900,
+                     dynamic_overrides={"alien_speed": 3.0})
+    outcome = play_recorded(game, path)
+
+    recording = Recording.load(path)
+    assert recording.settings["bullets_allowed"] == 3
+    assert recording.settings["dynamic_overrides"] == {"alien_speed": 3.0}
+    assert replay(recording) == outcome
+
+
+def test_save_load_round_trip(tmp_path):
+    path = tmp_path / "game.airp"
+    actions = bytes([0] * 300 + [5] * 70000 + [2, 4])
+    Recording(3, 120, 0.5, actions, (150, 2, 1),
+              {"bullets_allowed": 5}).save(path)
+
+    recording = Recording.load(path)
+    assert (recording.seed, recording.sim_hz) == (3, 120)
+    assert recording.actions == actions
+    assert recording.outcome == (150, 2, 1)
+    assert recording.settings == {"bullets_allowed": 5}
@@ -0,0 +1,57 @@
+import sqlite3
+from score_store import ScoreStore
+
+
+def test_scores_are_written_in_batches(tmp_path):
+    store = ScoreStore(tmp_path / "scores.db", batch_delay=0.05)
+    for score in (100, 300, 200):
+        store.add(score, level=1, duration=10.0)
+    store.flush()
+    assert store.high_score() == 300
+    assert [row[0] for row in store.top(2)] == [300, 200]
+    store.close()
+
+
+def test_failed_write_does_not_block(tmp_path):
+    path = tmp_path / "scores.db"
+    store = ScoreStore(path, batch_delay=0)
+    # make every insert fail
+    with sqlite3.connect(path) as connection:
+        connection.execute("DROP TABLE games")
+
+    store.add(100, level=1, duration=10.0)
+    store.flush()
+    assert store.failed == 1
+    assert store.written == 0
+    store.close()
+    assert not store._writer.is_alive()
+
+
+def test_top_scores_are_listed_until_play(make_game, tmp_path):
+    path = tmp_path / "scores.db"
+    store = ScoreStore(path, batch_delay=0)
+    for score in (50, 700, 300):
+        store.add(score, level=1, duration=1.0)
+    store.close()
+
+    game = make_game(score_db_path=str(path))
+    # headless games don't keep scores, so open the store as the game does
+    game.scores = ScoreStore(path)
+    game.sb = type(game.sb)(game)
+    assert game.sb.top_scores == [700, 300, 50]
+
+    game.stats.score = 400
+    game._save_result()
+    assert game.sb.top_scores == [700, 400, 300, 50]
+    game.scores.close()
+
+
+def test_replays_are_not_stored(make_game, tmp_path):
+    game = make_game()
+    game.scores = ScoreStore(tmp_path / "scores.db", batch_delay=0)
+    game.replayer = object()
+    game.stats.score = 400
+    game._save_result()
+    game.scores.flush()
+    assert game.scores.high_score() == 0
+    game.scores.close()